@@ -6,7 +6,7 @@ PostgreSQL адаптер для Storage API.
 """
 
 import json
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 import asyncio
 from contextlib import asynccontextmanager
 
@@ -19,6 +19,10 @@ except ImportError:
 from .storage_adapter import StorageAdapter
 
 
+# Размер страницы при итерации ключей
+_KEYS_PAGE_SIZE = 1000
+
+
 class PostgreSQLAdapter(StorageAdapter):
     """PostgreSQL адаптер для key-value хранилища с namespace.
 
@@ -119,6 +123,33 @@ class PostgreSQLAdapter(StorageAdapter):
                 )
                 return None
 
+    async def batch_get(self, namespace: str, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """Массовое чтение значений одним запросом (key = ANY($2))."""
+        if not keys:
+            return {}
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT key, value FROM storage WHERE namespace = $1 AND key = ANY($2::text[])",
+                namespace, list(keys)
+            )
+        result: dict[str, dict[str, Any]] = {}
+        for row in rows:
+            value = row["value"]
+            if isinstance(value, (str, bytes, bytearray)):
+                try:
+                    value = json.loads(value)
+                except (json.JSONDecodeError, ValueError, TypeError) as e:
+                    import sys
+                    print(
+                        f"[PostgreSQLAdapter] Ошибка парсинга JSON для {namespace}.{row['key']}: {e}",
+                        file=sys.stderr
+                    )
+                    continue
+            if value is not None:
+                result[row["key"]] = value
+        return result
+
     async def set(self, namespace: str, key: str, value: dict[str, Any]) -> None:
         """Сохранить значение в storage.
         
@@ -156,6 +187,32 @@ class PostgreSQLAdapter(StorageAdapter):
             )
             return [row["key"] for row in rows]
 
+    async def iter_keys(
+        self,
+        namespace: str,
+        prefix: str = "",
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """Итерировать ключи namespace страницами (keyset pagination)."""
+        pool = await self._get_pool()
+        remaining = limit
+        after = ""
+        while remaining is None or remaining > 0:
+            page_size = _KEYS_PAGE_SIZE if remaining is None else min(_KEYS_PAGE_SIZE, remaining)
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(
+                    "SELECT key FROM storage WHERE namespace = $1 AND key > $2 "
+                    "AND starts_with(key, $3) ORDER BY key LIMIT $4",
+                    namespace, after, prefix, page_size
+                )
+            for row in rows:
+                yield row["key"]
+            if len(rows) < page_size:
+                return
+            after = rows[-1]["key"]
+            if remaining is not None:
+                remaining -= len(rows)
+
     async def clear_namespace(self, namespace: str) -> None:
         """Очистить все записи в namespace."""
         pool = await self._get_pool()
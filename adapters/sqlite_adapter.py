@@ -5,17 +5,58 @@ SQLite адаптер для Storage API.
 Одна таблица: namespace | key | value (JSON as TEXT).
 """
 
+import itertools
 import json
 import sqlite3
 import threading
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 import asyncio
 from contextlib import asynccontextmanager
 
 from .storage_adapter import StorageAdapter
 
 
+# Максимум ключей в одном IN (...) — ниже старого лимита SQLITE_MAX_VARIABLE_NUMBER (999)
+_SQLITE_MAX_PARAMS = 500
+# Размер страницы при итерации ключей
+_KEYS_PAGE_SIZE = 1000
+# Счётчик имён in-memory БД (уникальное имя на экземпляр адаптера)
+_MEMORY_DB_IDS = itertools.count()
+# Версия схемы в PRAGMA user_version; совпадает — DDL при инициализации пропускается
+_SCHEMA_VERSION = 1
+# Допустимые режимы PRAGMA synchronous
+_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+# Размер кеша подготовленных выражений на соединение (по умолчанию в sqlite3 — 128).
+# batch_get/batch_set порождают разные тексты SQL по числу плейсхолдеров
+_CACHED_STATEMENTS = 256
+# Страница ключей в диапазоне [lower, upper) — скан ограничен первичным ключом
+_KEYS_PAGE_SQL = "SELECT key FROM storage WHERE namespace = ? AND key >= ? ORDER BY key LIMIT ?"
+_KEYS_RANGE_PAGE_SQL = (
+    "SELECT key FROM storage WHERE namespace = ? AND key >= ? AND key < ? "
+    "ORDER BY key LIMIT ?"
+)
+
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """
+    Наименьшая строка, большая всех строк с префиксом prefix.
+
+    Порядок кодовых точек совпадает с побайтовым сравнением UTF-8 (BINARY collation).
+
+    Returns:
+        Верхняя граница или None, если она не нужна (пустой префикс и т.п.)
+    """
+    stripped = prefix.rstrip(chr(0x10FFFF))
+    if not stripped:
+        return None
+    code = ord(stripped[-1]) + 1
+    # Суррогаты не кодируются в UTF-8 — следующая допустимая кодовая точка
+    if 0xD800 <= code <= 0xDFFF:
+        code = 0xE000
+    return stripped[:-1] + chr(code)
+
+
 class SQLiteAdapter(StorageAdapter):
     """SQLite адаптер для key-value хранилища с namespace.
 
@@ -27,15 +68,44 @@ class SQLiteAdapter(StorageAdapter):
     InterfaceError при параллельных запросах из разных потоков.
     """
 
-    def __init__(self, db_path: str = "data.db"):
+    def __init__(
+        self,
+        db_path: str = "data.db",
+        synchronous: str = "NORMAL",
+        cache_size_kb: int = 20000,
+        mmap_size: int = 134217728,
+    ):
         """
         Инициализация адаптера (без создания схемы).
 
         Args:
             db_path: путь к файлу базы данных (или ':memory:' для in-memory БД)
+            synchronous: PRAGMA synchronous (в WAL режиме NORMAL безопасен и быстрее FULL)
+            cache_size_kb: размер page cache на соединение в KiB
+            mmap_size: размер memory-mapped I/O в байтах (0 — выключен)
         """
+        synchronous = synchronous.upper()
+        if synchronous not in _SYNCHRONOUS_MODES:
+            raise ValueError(f"synchronous must be one of {_SYNCHRONOUS_MODES}, got: {synchronous!r}")
         self.db_path = db_path
+        # PRAGMA для каждого нового соединения; строка собирается один раз.
+        # WAL: читатели не блокируются писателем (и наоборот)
+        self._connection_pragmas = (
+            "PRAGMA journal_mode=WAL;"
+            f"PRAGMA synchronous={synchronous};"
+            "PRAGMA temp_store=MEMORY;"
+            f"PRAGMA cache_size={-int(cache_size_kb)};"
+            f"PRAGMA mmap_size={int(mmap_size)};"
+        )
         self._local = threading.local()  # Thread-local storage для connections и transactions
+        if db_path == ":memory:":
+            # У каждого thread-local соединения к ':memory:' была бы своя пустая БД —
+            # используем именованную in-memory БД с общим кешем для всех потоков
+            self._connect_target = f"file:sqlite_adapter_mem_{next(_MEMORY_DB_IDS)}?mode=memory&cache=shared"
+            self._connect_uri = True
+        else:
+            self._connect_target = db_path
+            self._connect_uri = False
 
     def _get_connection(self) -> sqlite3.Connection:
         """Создать или вернуть thread-local соединение.
@@ -46,12 +116,14 @@ class SQLiteAdapter(StorageAdapter):
         if not hasattr(self._local, 'conn') or self._local.conn is None:
             # Создаем новое соединение для текущего потока
             self._local.conn = sqlite3.connect(
-                self.db_path,
+                self._connect_target,
                 check_same_thread=True,  # Теперь каждый поток имеет свое соединение
-                timeout=30.0  # Таймаут для database locked ситуаций
+                timeout=30.0,  # Таймаут для database locked ситуаций
+                uri=self._connect_uri,
+                cached_statements=_CACHED_STATEMENTS,
             )
-            # Включаем WAL mode для лучшей параллельной работы
-            self._local.conn.execute("PRAGMA journal_mode=WAL")
+            # WAL, synchronous, кеш страниц и mmap — один раз на соединение
+            self._local.conn.executescript(self._connection_pragmas)
         return self._local.conn
     
     def _get_in_transaction(self) -> bool:
@@ -65,6 +137,8 @@ class SQLiteAdapter(StorageAdapter):
     def _create_schema_sync(self) -> None:
         """Синхронная функция создания таблицы схемы."""
         conn = self._get_connection()
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+            return
         conn.execute("""
             CREATE TABLE IF NOT EXISTS storage (
                 namespace TEXT NOT NULL,
@@ -73,6 +147,7 @@ class SQLiteAdapter(StorageAdapter):
                 PRIMARY KEY (namespace, key)
             )
         """)
+        conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
         conn.commit()
 
     async def initialize_schema(self) -> None:
@@ -81,11 +156,14 @@ class SQLiteAdapter(StorageAdapter):
         Для файловой БД создаёт директорию и таблицу. Для ':memory:' просто
         создаёт таблицу в in-memory БД.
         """
-        # Создать директорию только если это не :memory:
-        if self.db_path != ":memory:":
-            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        def _init_sync() -> None:
+            # Создать директорию только если это не :memory:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._create_schema_sync()
 
-        await asyncio.to_thread(self._create_schema_sync)
+        # mkdir и DDL — блокирующие syscalls, выполняем вне event loop
+        await asyncio.to_thread(_init_sync)
 
     async def get(self, namespace: str, key: str) -> Optional[dict[str, Any]]:
         """Получить значение из storage (выполняется в threadpool)."""
@@ -99,27 +177,55 @@ class SQLiteAdapter(StorageAdapter):
             row = cursor.fetchone()
             if row is None:
                 return None
-            # Проверяем, что значение не None
-            value = row[0]
-            if value is None:
-                return None
-            # Проверяем, что это строка перед десериализацией
-            if not isinstance(value, (str, bytes, bytearray)):
-                return None
-            try:
-                return json.loads(value)
-            except (json.JSONDecodeError, ValueError, TypeError) as e:
-                # Логируем ошибку парсинга, но не падаем
-                # Возвращаем None, чтобы система могла продолжить работу
-                import sys
-                print(
-                    f"[SQLiteAdapter] Ошибка парсинга JSON для {ns}.{k}: {e}",
-                    file=sys.stderr
-                )
-                return None
+            return self._decode_value(ns, k, row[0])
 
         return await asyncio.to_thread(_get_sync, namespace, key)
 
+    async def batch_get(self, namespace: str, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """Массовое чтение значений одним запросом (выполняется в threadpool)."""
+
+        def _batch_get_sync(ns: str, keys_list: list[str]) -> dict[str, dict[str, Any]]:
+            conn = self._get_connection()
+            result: dict[str, dict[str, Any]] = {}
+            # Разбиваем на части, чтобы не превысить лимит параметров SQLite
+            for i in range(0, len(keys_list), _SQLITE_MAX_PARAMS):
+                chunk = keys_list[i:i + _SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = conn.execute(
+                    f"SELECT key, value FROM storage WHERE namespace = ? AND key IN ({placeholders})",
+                    (ns, *chunk),
+                )
+                for k, raw in cursor.fetchall():
+                    value = self._decode_value(ns, k, raw)
+                    if value is not None:
+                        result[k] = value
+            return result
+
+        if not keys:
+            return {}
+        return await asyncio.to_thread(_batch_get_sync, namespace, list(keys))
+
+    @staticmethod
+    def _decode_value(ns: str, k: str, value: Any) -> Optional[dict[str, Any]]:
+        """Десериализовать JSON-значение из строки таблицы."""
+        # Проверяем, что значение не None
+        if value is None:
+            return None
+        # Проверяем, что это строка перед десериализацией
+        if not isinstance(value, (str, bytes, bytearray)):
+            return None
+        try:
+            return json.loads(value)
+        except (json.JSONDecodeError, ValueError, TypeError) as e:
+            # Логируем ошибку парсинга, но не падаем
+            # Возвращаем None, чтобы система могла продолжить работу
+            import sys
+            print(
+                f"[SQLiteAdapter] Ошибка парсинга JSON для {ns}.{k}: {e}",
+                file=sys.stderr
+            )
+            return None
+
     async def set(self, namespace: str, key: str, value: dict[str, Any]) -> None:
         """Сохранить значение в storage (выполняется в threadpool)."""
 
@@ -166,6 +272,38 @@ class SQLiteAdapter(StorageAdapter):
 
         return await asyncio.to_thread(_list_keys_sync, namespace)
 
+    async def iter_keys(
+        self,
+        namespace: str,
+        prefix: str = "",
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """Итерировать ключи namespace страницами (keyset pagination в threadpool)."""
+
+        upper = _prefix_upper_bound(prefix)
+
+        def _page_sync(ns: str, lower: str, page_size: int) -> list[str]:
+            conn = self._get_connection()
+            if upper is None:
+                cursor = conn.execute(_KEYS_PAGE_SQL, (ns, lower, page_size))
+            else:
+                cursor = conn.execute(_KEYS_RANGE_PAGE_SQL, (ns, lower, upper, page_size))
+            return [row[0] for row in cursor.fetchall()]
+
+        remaining = limit
+        lower = prefix
+        while remaining is None or remaining > 0:
+            page_size = _KEYS_PAGE_SIZE if remaining is None else min(_KEYS_PAGE_SIZE, remaining)
+            page = await asyncio.to_thread(_page_sync, namespace, lower, page_size)
+            for key in page:
+                yield key
+            if len(page) < page_size:
+                return
+            # Следующая страница — с наименьшей строки, большей последнего ключа
+            lower = page[-1] + "\0"
+            if remaining is not None:
+                remaining -= len(page)
+
     async def clear_namespace(self, namespace: str) -> None:
         """Очистить все записи в namespace (выполняется в threadpool)."""
 
@@ -222,12 +360,11 @@ class SQLiteAdapter(StorageAdapter):
         
         def _batch_set_sync(ns: str, items_dict: dict[str, dict[str, Any]], in_transaction: bool):
             conn = self._get_connection()
-            for key, value in items_dict.items():
-                json_value = json.dumps(value, ensure_ascii=False)
-                conn.execute(
-                    "INSERT OR REPLACE INTO storage (namespace, key, value) VALUES (?, ?, ?)",
-                    (ns, key, json_value),
-                )
+            # executemany — один подготовленный запрос на всю пачку
+            conn.executemany(
+                "INSERT OR REPLACE INTO storage (namespace, key, value) VALUES (?, ?, ?)",
+                [(ns, key, json.dumps(value, ensure_ascii=False)) for key, value in items_dict.items()],
+            )
             # Не делаем commit если мы в транзакции
             if not in_transaction:
                 # CRITICAL: ВСЕГДА делаем commit и выбрасываем исключение при ошибке
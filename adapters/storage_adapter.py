@@ -27,6 +27,23 @@ class StorageAdapter(ABC):
         """
         pass
 
+    @abstractmethod
+    async def batch_get(self, namespace: str, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Массовое чтение значений из namespace за один запрос к хранилищу.
+        
+        Args:
+            namespace: пространство имён
+            keys: список ключей
+            
+        Returns:
+            Словарь {key: value} только для найденных ключей
+        
+        Пример:
+            values = await adapter.batch_get("devices", ["device1", "device2"])
+        """
+        pass
+
     @abstractmethod
     async def set(self, namespace: str, key: str, value: dict[str, Any]) -> None:
         """
@@ -66,6 +83,30 @@ class StorageAdapter(ABC):
         """
         pass
 
+    @abstractmethod
+    def iter_keys(
+        self,
+        namespace: str,
+        prefix: str = "",
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Итерировать ключи namespace постранично, не загружая их все в память.
+        
+        Args:
+            namespace: пространство имён
+            prefix: вернуть только ключи с этим префиксом
+            limit: максимальное количество ключей (None — без ограничения)
+            
+        Yields:
+            Ключи в порядке сортировки
+        
+        Пример:
+            async for key in adapter.iter_keys("devices", prefix="lamp_"):
+                ...
+        """
+        pass
+
     @abstractmethod
     async def clear_namespace(self, namespace: str) -> None:
         """
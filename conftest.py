@@ -0,0 +1,44 @@
+"""
+Общие фикстуры для smoke-тестов вне tests/ (dev-scripts/, docs/).
+
+Runtime поднимается один раз на сессию: инициализация схемы, загрузка
+плагинов и подписки на события не повторяются в каждом тесте.
+Между тестами состояние сбрасывается через storage.clear_namespace().
+"""
+
+import asyncio
+
+import pytest_asyncio
+
+from adapters.sqlite_adapter import SQLiteAdapter
+from core.runtime import CoreRuntime
+from plugins.test import AutomationStubPlugin, SystemLoggerPlugin
+
+
+# Namespaces, которые тесты меняют и которые нужно очищать между ними
+_RESET_NAMESPACES = ("presence", "devices")
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def runtime():
+    """Один запущенный CoreRuntime (in-memory SQLite) на всю сессию."""
+    adapter = SQLiteAdapter(":memory:")
+    await adapter.initialize_schema()
+    rt = CoreRuntime(adapter)
+    # Зависимостей между плагинами на этапе load нет — загружаем параллельно;
+    # start() остаётся последовательным (нужны все зарегистрированные сервисы)
+    await asyncio.gather(
+        rt.plugin_manager.auto_load_plugins(),
+        rt.plugin_manager.load_plugins([SystemLoggerPlugin(rt), AutomationStubPlugin(rt)]),
+    )
+    await rt.start()
+    yield rt
+    await rt.shutdown()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def clean_runtime(runtime):
+    """Общий runtime с очисткой изменяемых namespaces после теста."""
+    yield runtime
+    for namespace in _RESET_NAMESPACES:
+        await runtime.storage.clear_namespace(namespace)
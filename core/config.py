@@ -18,6 +18,11 @@ class Config:
     # Путь к файлу БД (для SQLite)
     db_path: str = "data/runtime.db"
 
+    # SQLite PRAGMA для каждого соединения
+    sqlite_synchronous: str = "NORMAL"  # OFF | NORMAL | FULL | EXTRA
+    sqlite_cache_size_kb: int = 20000  # page cache на соединение, KiB
+    sqlite_mmap_size: int = 134217728  # memory-mapped I/O, байты (0 — выключен)
+
     # PostgreSQL настройки
     pg_host: str = "localhost"
     pg_port: int = 5432
@@ -87,6 +92,22 @@ class Config:
                 raise ValueError("db_path must be non-empty for SQLite storage")
             if not isinstance(self.db_path, str):
                 raise ValueError(f"db_path must be string, got: {type(self.db_path).__name__}")
+            if not isinstance(self.sqlite_synchronous, str):
+                raise ValueError(
+                    f"sqlite_synchronous must be string, got: {type(self.sqlite_synchronous).__name__}"
+                )
+            if self.sqlite_synchronous.upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+                raise ValueError(
+                    f"sqlite_synchronous must be OFF, NORMAL, FULL or EXTRA, got: {self.sqlite_synchronous!r}"
+                )
+            if not isinstance(self.sqlite_cache_size_kb, int) or self.sqlite_cache_size_kb < 0:
+                raise ValueError(
+                    f"sqlite_cache_size_kb must be non-negative integer, got: {self.sqlite_cache_size_kb}"
+                )
+            if not isinstance(self.sqlite_mmap_size, int) or self.sqlite_mmap_size < 0:
+                raise ValueError(
+                    f"sqlite_mmap_size must be non-negative integer, got: {self.sqlite_mmap_size}"
+                )
         
         # Валидация PostgreSQL параметров
         if self.storage_type == "postgresql":
@@ -157,6 +178,9 @@ class Config:
         config = cls(
             storage_type=os.getenv("RUNTIME_STORAGE_TYPE", "sqlite"),
             db_path=os.getenv("RUNTIME_DB_PATH", "data/runtime.db"),
+            sqlite_synchronous=os.getenv("RUNTIME_SQLITE_SYNCHRONOUS", "NORMAL").upper(),
+            sqlite_cache_size_kb=int(os.getenv("RUNTIME_SQLITE_CACHE_SIZE_KB", "20000")),
+            sqlite_mmap_size=int(os.getenv("RUNTIME_SQLITE_MMAP_SIZE", "134217728")),
             pg_host=os.getenv("RUNTIME_PG_HOST", "localhost"),
             pg_port=int(os.getenv("RUNTIME_PG_PORT", "5432")),
             pg_database=os.getenv("RUNTIME_PG_DATABASE", "homeconsole"),
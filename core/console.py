@@ -75,17 +75,26 @@ async def _call_service(runtime: CoreRuntime, endpoint: HttpEndpoint, path_param
     return await runtime.service_registry.call(service_name, *ordered_values, **extra_kwargs)
 
 
-async def run_cli(argv: Optional[List[str]] = None, input_func: Callable[[str], str] = input, shutdown_on_exit: bool = True) -> CoreRuntime:
-    config = Config.from_env()
-    # Создать директорию для БД, если нужно (только для SQLite)
-    if config.storage_type == "sqlite":
-        Path(config.db_path).parent.mkdir(parents=True, exist_ok=True)
-    adapter = await create_storage_adapter(config)
-    runtime = CoreRuntime(adapter)
+async def run_cli(
+    argv: Optional[List[str]] = None,
+    input_func: Callable[[str], str] = input,
+    shutdown_on_exit: bool = True,
+    runtime: Optional[CoreRuntime] = None,
+) -> CoreRuntime:
+    # Уже запущенный runtime (например, общий в тестах) используется как есть
+    if runtime is None:
+        config = Config.from_env()
+        # Создать директорию для БД, если нужно (только для SQLite)
+        if config.storage_type == "sqlite" and config.db_path != ":memory:":
+            await asyncio.to_thread(
+                Path(config.db_path).parent.mkdir, parents=True, exist_ok=True
+            )
+        adapter = await create_storage_adapter(config)
+        runtime = CoreRuntime(adapter)
 
-    await _auto_load_plugins(runtime)
+        await _auto_load_plugins(runtime)
 
-    await runtime.start()
+        await runtime.start()
 
     endpoints = runtime.http.list()
 
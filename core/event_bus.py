@@ -8,12 +8,29 @@ EventBus - простой механизм pub/sub для событий.
 """
 
 import asyncio
+import inspect
+import sys
 from collections import defaultdict
 from typing import Any, Callable, Awaitable
 
 
-# Тип для обработчика событий
-EventHandler = Callable[[str, dict[str, Any]], Awaitable[None]]
+# Тип для обработчика событий: async функция или обычная функция
+# (обычная вызывается inline, без создания корутины/Task на событие)
+EventHandler = Callable[[str, dict[str, Any]], Awaitable[None] | None]
+
+
+def _report_handler_error(event_type: str, error: BaseException) -> None:
+    """Залогировать ошибку обработчика события (best-effort, в stderr)."""
+    # EventBus не имеет прямого доступа к runtime,
+    # поэтому логируем только в stderr для отладки
+    try:
+        print(
+            f"[EventBus] Ошибка в обработчике события '{event_type}': {error}",
+            file=sys.stderr
+        )
+    except Exception:
+        # Игнорируем ошибки логирования
+        pass
 
 
 class EventBus:
@@ -38,7 +55,8 @@ class EventBus:
         
         Args:
             event_type: тип события (например, "device.state_changed")
-            handler: async функция-обработчик
+            handler: async функция-обработчик или обычная функция
+                     (вызывается синхронно внутри publish(), не должна блокировать)
             
         Пример:
             async def on_state_changed(event_type: str, data: dict):
@@ -47,6 +65,9 @@ class EventBus:
             
             await event_bus.subscribe("device.state_changed", on_state_changed)
         """
+        # Ключ словаря интернируем: publish() с тем же литералом/константой
+        # находит его по совпадению указателя, без сравнения строк
+        event_type = sys.intern(event_type)
         async with self._lock:
             self._handlers[event_type].append(handler)
 
@@ -83,28 +104,32 @@ class EventBus:
         async with self._lock:
             handlers = list(self._handlers.get(event_type, []))
         
-        # Запускаем все обработчики параллельно
-        if handlers:
-            tasks = [handler(event_type, data) for handler in handlers]
+        # Синхронные обработчики выполняются сразу, async — параллельно
+        awaitables = []
+        for handler in handlers:
+            try:
+                result = handler(event_type, data)
+            except Exception as e:
+                # Игнорируем ошибки в обработчиках, чтобы не падать
+                _report_handler_error(event_type, e)
+                continue
+            if inspect.isawaitable(result):
+                awaitables.append(result)
+
+        if len(awaitables) == 1:
+            # Один async обработчик — ждём напрямую, без Task через gather
+            try:
+                await awaitables[0]
+            except Exception as e:
+                _report_handler_error(event_type, e)
+        elif awaitables:
             # Игнорируем ошибки в обработчиках, чтобы не падать
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            results = await asyncio.gather(*awaitables, return_exceptions=True)
             
             # Логируем ошибки в обработчиках
-            for i, result in enumerate(results):
+            for result in results:
                 if isinstance(result, Exception):
-                    # Пытаемся залогировать через service_registry, если доступен
-                    # Это best-effort, не должно ломать публикацию событий
-                    try:
-                        # EventBus не имеет прямого доступа к runtime,
-                        # поэтому логируем только в stderr для отладки
-                        import sys
-                        print(
-                            f"[EventBus] Ошибка в обработчике события '{event_type}': {result}",
-                            file=sys.stderr
-                        )
-                    except Exception:
-                        # Игнорируем ошибки логирования
-                        pass
+                    _report_handler_error(event_type, result)
 
     async def get_subscribers_count(self, event_type: str) -> int:
         """
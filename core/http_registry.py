@@ -5,8 +5,9 @@ HTTP Interface Registry для Core Runtime.
 Не выполняет HTTP-запросы и не зависит от фреймворков.
 """
 
+import sys
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import FrozenSet, List, Optional, Dict, Any
 
 
 @dataclass
@@ -32,7 +33,7 @@ class HttpEndpoint:
 class HttpRegistry:
     """Реестр HTTP-контрактов.
 
-    Методы: `register`, `list`, `clear`.
+    Методы: `register`, `list`, `paths`, `clear`.
     """
 
     def __init__(self):
@@ -40,6 +41,8 @@ class HttpRegistry:
         self._endpoints: List[HttpEndpoint] = []
         # set of (method, path) for quick uniqueness check
         self._index = set()
+        # кэш множества путей для paths(); сбрасывается при register/clear
+        self._paths: Optional[FrozenSet[str]] = None
 
     def register(self, endpoint: HttpEndpoint, version: Optional[str] = None) -> None:
         """Зарегистрировать HTTP-контракт.
@@ -77,6 +80,9 @@ class HttpRegistry:
             # Добавляем версию к пути: /v1/path или /v2/path
             path = f"/{version_prefix}{path}"
 
+        # Путь интернируем: один путь с разными методами (GET/POST)
+        # хранится одним объектом, проверки `in paths()` идут по указателю
+        path = sys.intern(path)
         key = (method, path)
         if key in self._index:
             raise ValueError(f"Контракт для {method} {path} уже зарегистрирован")
@@ -85,17 +91,27 @@ class HttpRegistry:
         ep = HttpEndpoint(
             method=method,
             path=path,
-            service=endpoint.service,
+            service=sys.intern(endpoint.service),
             description=endpoint.description,
             version=api_version
         )
         self._endpoints.append(ep)
         self._index.add(key)
+        self._paths = None
 
     def list(self) -> List[HttpEndpoint]:
         """Вернуть копию списка всех зарегистрированных контрактов."""
         return list(self._endpoints)
 
+    def paths(self) -> FrozenSet[str]:
+        """Вернуть множество зарегистрированных путей (для O(1) проверок `in`).
+
+        Множество строится один раз и кэшируется до следующего register/clear.
+        """
+        if self._paths is None:
+            self._paths = frozenset(ep.path for ep in self._endpoints)
+        return self._paths
+
     def clear(self, plugin_name: Optional[str] = None) -> None:
         """Удалить контракты.
 
@@ -106,6 +122,7 @@ class HttpRegistry:
         if plugin_name is None:
             self._endpoints.clear()
             self._index.clear()
+            self._paths = None
             return
 
         def owner_of(service: str) -> Optional[str]:
@@ -124,6 +141,7 @@ class HttpRegistry:
 
         self._endpoints = remaining
         self._index = new_index
+        self._paths = None
     
     def get_versions(self, service_name: str) -> List[str]:
         """
@@ -30,6 +30,7 @@ ModuleManager — менеджер встроенных модулей Runtime.
 """
 
 from typing import Any, Dict, List, Optional
+import asyncio
 import sys
 import importlib
 import importlib.util
@@ -188,30 +189,43 @@ class ModuleManager:
 
         Вызывается при runtime.start().
 
+        Модули запускаются параллельно: зависимости между ними устанавливаются
+        в register() (сервисы, подписки), start() друг от друга не зависят.
+        Время старта — самый долгий start(), а не сумма всех.
+
         Raises:
             RuntimeError: если REQUIRED модуль упал в start()
         """
         failed_required = []
         
-        for module in self._modules.values():
+        modules = list(self._modules.values())
+        results = await asyncio.gather(
+            *(module.start() for module in modules),
+            return_exceptions=True
+        )
+        
+        for module, result in zip(modules, results):
+            if not isinstance(result, BaseException):
+                continue
+            if not isinstance(result, Exception):
+                # CancelledError/KeyboardInterrupt не глотаем
+                raise result
+            e = result
             is_required = module.name in REQUIRED_MODULES
-            try:
-                await module.start()
-            except Exception as e:
-                if is_required:
-                    failed_required.append((module.name, str(e)))
-                else:
-                    # Для OPTIONAL модулей логируем, но не останавливаем runtime
-                    try:
-                        await log_error(
-                            self._runtime,
-                            f"Ошибка при запуске optional модуля '{module.name}': {e}",
-                            component="module_manager",
-                            module=module.name
-                        )
-                    except Exception:
-                        # Fallback на print если logger недоступен
-                        print(f"[ModuleManager] Ошибка при запуске optional модуля '{module.name}': {e}", file=sys.stderr)
+            if is_required:
+                failed_required.append((module.name, str(e)))
+            else:
+                # Для OPTIONAL модулей логируем, но не останавливаем runtime
+                try:
+                    await log_error(
+                        self._runtime,
+                        f"Ошибка при запуске optional модуля '{module.name}': {e}",
+                        component="module_manager",
+                        module=module.name
+                    )
+                except Exception:
+                    # Fallback на print если logger недоступен
+                    print(f"[ModuleManager] Ошибка при запуске optional модуля '{module.name}': {e}", file=sys.stderr)
         
         if failed_required:
             failed_names = [name for name, _ in failed_required]
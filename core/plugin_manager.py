@@ -11,11 +11,12 @@ PluginManager - управление lifecycle плагинов.
 Подробный контракт: docs/08-PLUGIN-CONTRACT.md
 """
 
+import asyncio
 import importlib
 import json
 import sys
 from pathlib import Path
-from typing import Optional, TYPE_CHECKING, Callable, Awaitable, Dict, Any, List
+from typing import Optional, TYPE_CHECKING, Callable, Awaitable, Dict, Any, Iterable, List
 from enum import Enum
 
 from core.base_plugin import BasePlugin, PluginMetadata
@@ -109,6 +110,28 @@ class PluginManager:
             # Пробросываем оригинальное исключение, чтобы тесты могли его ловить
             raise
 
+    async def load_plugins(self, plugins: Iterable[BasePlugin]) -> None:
+        """
+        Загрузить несколько плагинов одним вызовом.
+        
+        on_load() плагинов выполняются параллельно, поэтому плагины в пакете
+        не должны зависеть друг от друга (зависимые грузите отдельным вызовом).
+        Ошибка одного плагина не прерывает загрузку остальных.
+        
+        Args:
+            plugins: экземпляры плагинов
+            
+        Raises:
+            Exception: первая ошибка загрузки (после завершения всех load)
+        """
+        results = await asyncio.gather(
+            *(self.load_plugin(plugin) for plugin in plugins),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
     async def start_plugin(self, plugin_name: str) -> None:
         """
         Запустить плагин.
@@ -521,7 +544,6 @@ class PluginManager:
         if remaining:
             # Логируем предупреждение, но продолжаем загрузку
             try:
-                import asyncio
                 asyncio.create_task(warning(
                     self._runtime,
                     f"Обнаружены возможные циклические зависимости между плагинами: {remaining}",
@@ -594,29 +616,45 @@ class PluginManager:
         # Шаг 2: Топологическая сортировка по зависимостям
         load_order = self._topological_sort_manifests(manifests)
         
-        # Шаг 3: Загружаем плагины в правильном порядке
+        # Шаг 3: Разбиваем плагины на волны: плагин попадает в волну после
+        # всех своих зависимостей, поэтому плагины одной волны независимы
+        waves: Dict[int, List[str]] = {}
+        levels: Dict[str, int] = {}
         for plugin_name in load_order:
             if plugin_name not in manifests:
                 continue
-            
-            manifest = manifests[plugin_name]
-            plugin_dir = plugin_dirs[plugin_name]
-            
-            # Проверяем, что все зависимости уже загружены
-            dependencies = manifest.get("dependencies", [])
-            missing_deps = [dep for dep in dependencies if dep not in self._plugins]
-            
-            if missing_deps:
-                await actual_logger_func(
-                    self._runtime,
-                    f"Пропущен плагин '{plugin_name}': отсутствуют зависимости {missing_deps}",
-                    component="plugin_manager"
+            dependencies = manifests[plugin_name].get("dependencies", [])
+            level = 1 + max((levels[dep] for dep in dependencies if dep in levels), default=-1)
+            levels[plugin_name] = level
+            waves.setdefault(level, []).append(plugin_name)
+        
+        # Шаг 4: Загружаем волны по порядку, плагины внутри волны — параллельно
+        for level in sorted(waves):
+            pending = []
+            for plugin_name in waves[level]:
+                manifest = manifests[plugin_name]
+                plugin_dir = plugin_dirs[plugin_name]
+                
+                # Проверяем, что все зависимости уже загружены (в предыдущих волнах)
+                dependencies = manifest.get("dependencies", [])
+                missing_deps = [dep for dep in dependencies if dep not in self._plugins]
+                
+                if missing_deps:
+                    await actual_logger_func(
+                        self._runtime,
+                        f"Пропущен плагин '{plugin_name}': отсутствуют зависимости {missing_deps}",
+                        component="plugin_manager"
+                    )
+                    continue
+                
+                # Загружаем плагин из манифеста
+                # Логирование происходит внутри _load_plugin_from_manifest
+                pending.append(
+                    self._load_plugin_from_manifest(manifest, plugin_dir, actual_logger_func)
                 )
-                continue
             
-            # Загружаем плагин из манифеста
-            # Логирование происходит внутри _load_plugin_from_manifest
-            await self._load_plugin_from_manifest(manifest, plugin_dir, actual_logger_func)
+            # _load_plugin_from_manifest не пробрасывает исключения (логирует и возвращает False)
+            await asyncio.gather(*pending)
     
     def _detect_and_register_integration(
         self,
@@ -6,7 +6,8 @@ ServiceRegistry - реестр сервисов для вызова методо
 """
 
 import asyncio
-from typing import Any, Callable, Awaitable, List, Optional
+import sys
+from typing import Any, Callable, Awaitable, Iterable
 from abc import ABC, abstractmethod
 
 
@@ -68,7 +69,7 @@ class ServiceRegistry:
     - Все вызовы защищены timeout по умолчанию
     """
 
-    def __init__(self, default_timeout: Optional[float] = None):
+    def __init__(self, default_timeout: float | None = None):
         """
         Инициализация ServiceRegistry.
         
@@ -83,9 +84,9 @@ class ServiceRegistry:
         # Lock для thread-safety операций с _services
         self._lock = asyncio.Lock()
         # Дефолтный timeout для всех вызовов
-        self._default_timeout: Optional[float] = default_timeout
+        self._default_timeout: float | None = default_timeout
 
-    async def register(self, service_name: str, func: ServiceFunc, version: Optional[str] = None) -> None:
+    async def register(self, service_name: str, func: ServiceFunc, version: str | None = None) -> None:
         """
         Зарегистрировать сервис.
         
@@ -107,11 +108,17 @@ class ServiceRegistry:
             versioned_name = f"{service_name}.{version}"
         else:
             versioned_name = service_name
+        # Ключ интернируем: call() с литералом имени находит его по указателю
+        versioned_name = sys.intern(versioned_name)
         
         async with self._lock:
-            if versioned_name in self._services:
+            # setdefault — одна hash-операция вместо проверки `in` + присваивания.
+            # Дубликат определяем по размеру словаря: сравнение `is func`
+            # не сработает при повторной регистрации той же функции.
+            count = len(self._services)
+            self._services.setdefault(versioned_name, func)
+            if len(self._services) == count:
                 raise ValueError(f"Сервис '{versioned_name}' уже зарегистрирован")
-            self._services[versioned_name] = func
             # По умолчанию сервис не deprecated
             self._deprecated[versioned_name] = False
     
@@ -119,7 +126,7 @@ class ServiceRegistry:
         self,
         service_name: str,
         func: ServiceFunc,
-        middleware: List[ServiceMiddleware]
+        middleware: list[ServiceMiddleware]
     ) -> None:
         """
         Зарегистрировать сервис с middleware.
@@ -215,6 +222,22 @@ class ServiceRegistry:
         else:
             return await func(*args, **kwargs)
     
+    def get_callable(self, service_name: str) -> ServiceFunc | None:
+        """
+        Получить функцию сервиса для прямого вызова, минуя диспетчеризацию call().
+        
+        Предназначено для hot path внутри Core (trusted-код), который вызывает
+        один и тот же сервис многократно. default_timeout при прямом вызове
+        не применяется.
+        
+        Args:
+            service_name: имя сервиса
+            
+        Returns:
+            Функция сервиса или None, если сервис не зарегистрирован
+        """
+        return self._services.get(service_name)
+
     async def call_with_timeout(
         self,
         service_name: str,
@@ -249,6 +272,38 @@ class ServiceRegistry:
             timeout=timeout
         )
 
+    async def call_many(
+        self,
+        calls: Iterable[tuple[str, tuple, dict[str, Any]]]
+    ) -> list[Any]:
+        """
+        Вызвать несколько независимых сервисов конкурентно.
+        
+        Все вызовы отправляются сразу и выполняются параллельно (asyncio.gather),
+        результаты возвращаются в порядке вызовов. Зависимые вызовы (второй
+        требует результата или побочного эффекта первого) делайте через call()
+        последовательно.
+        
+        Args:
+            calls: последовательность кортежей (service_name, args, kwargs)
+            
+        Returns:
+            Список результатов в том же порядке, что и calls
+            
+        Raises:
+            ValueError: если какой-либо сервис не найден
+            Exception: первое исключение из вызовов (остальные вызовы не отменяются)
+            
+        Пример:
+            light, sensor = await service_registry.call_many([
+                ("devices.get", ("lamp_kitchen",), {}),
+                ("devices.get", ("sensor_hall",), {}),
+            ])
+        """
+        return list(await asyncio.gather(
+            *(self.call(name, *args, **kwargs) for name, args, kwargs in calls)
+        ))
+
     async def has_service(self, service_name: str) -> bool:
         """
         Проверить, существует ли сервис.
@@ -305,7 +360,7 @@ class ServiceRegistry:
                         versions.append(version)
             return sorted(versions)
     
-    async def is_deprecated(self, service_name: str, version: Optional[str] = None) -> bool:
+    async def is_deprecated(self, service_name: str, version: str | None = None) -> bool:
         """
         Проверить, является ли версия сервиса устаревшей.
         
@@ -327,7 +382,7 @@ class ServiceRegistry:
                 versioned_name = service_name
             return self._deprecated.get(versioned_name, False)
     
-    async def mark_deprecated(self, service_name: str, version: Optional[str] = None) -> None:
+    async def mark_deprecated(self, service_name: str, version: str | None = None) -> None:
         """
         Пометить версию сервиса как устаревшую.
         
@@ -7,7 +7,27 @@ StateEngine - управление общим состоянием runtime.
 
 from typing import Any, Optional
 import asyncio
+import heapq
 import time
+import weakref
+
+# Маркер отсутствующего значения (None — допустимое значение состояния)
+_MISSING = object()
+# Запас устаревших записей heap сверх 2 * len(_ttl), после которого heap пересобирается
+_HEAP_COMPACT_SLACK = 64
+
+
+def _expire_weak(engine_ref: "weakref.ref[StateEngine]", key: str, expires_at: float) -> None:
+    """Callback таймера истечения; не удерживает StateEngine от сборки мусора."""
+    engine = engine_ref()
+    if engine is not None:
+        engine._expire(key, expires_at)
+
+
+def _cancel_handles(handles: dict[str, asyncio.TimerHandle]) -> None:
+    """Отменить таймеры истечения удалённого сборщиком мусора StateEngine."""
+    for handle in handles.values():
+        handle.cancel()
 
 
 class StateEngine:
@@ -21,18 +41,37 @@ class StateEngine:
     - статус плагинов
     - флаги состояния системы
     - временные данные для координации
+
+    Lock не используется: все операции — синхронные операции над dict
+    без await внутри, а в однопоточном event loop они атомарны.
+
+    Истёкшие TTL-ключи удаляются лениво при обращении (get/exists/keys).
+    Ключи, к которым больше не обращаются, можно удалить вызовом sweep()
+    или включить точное удаление по таймеру параметром auto_sweep.
     """
 
-    def __init__(self):
+    def __init__(self, auto_sweep: bool = False):
+        """
+        Args:
+            auto_sweep: удалять TTL-ключи точно в момент истечения через
+                        loop.call_at (по умолчанию выключено — достаточно
+                        ленивой очистки)
+        """
         # In-memory хранилище состояния
         self._state: dict[str, Any] = {}
-        # TTL для ключей: key -> expiration timestamp
+        # TTL для ключей: key -> expiration timestamp (time.monotonic)
         self._ttl: dict[str, float] = {}
-        # Lock для безопасности в async коде
-        self._lock = asyncio.Lock()
-        # Фоновая задача для очистки истёкших ключей
-        self._cleanup_task: Optional[asyncio.Task] = None
-        self._cleanup_running = False
+        # Min-heap (expiration timestamp, key) для очистки без полного обхода _ttl.
+        # Записи могут устаревать (ключ перезаписан/удалён) — сверяются с _ttl.
+        self._expiry_heap: list[tuple[float, str]] = []
+        # Таймеры истечения ключей (только при auto_sweep): key -> handle
+        self._auto_sweep = auto_sweep
+        self._expiry_handles: dict[str, asyncio.TimerHandle] = {}
+        # Таймеры ссылаются на StateEngine через weakref; при сборке мусора
+        # оставшиеся таймеры отменяются
+        self._weak_self = weakref.ref(self)
+        if auto_sweep:
+            weakref.finalize(self, _cancel_handles, self._expiry_handles)
 
     async def get(self, key: str) -> Optional[Any]:
         """
@@ -44,15 +83,16 @@ class StateEngine:
         Returns:
             Значение или None (если ключ истёк или не существует)
         """
-        async with self._lock:
-            # Проверяем TTL перед возвратом значения
-            if key in self._ttl:
-                if time.time() > self._ttl[key]:
-                    # Ключ истёк - удаляем его
-                    self._state.pop(key, None)
-                    del self._ttl[key]
-                    return None
+        # Проверяем TTL перед возвратом значения
+        if not self._ttl:
             return self._state.get(key)
+        expires_at = self._ttl.get(key)
+        if expires_at is not None and time.monotonic() > expires_at:
+            # Ключ истёк - удаляем его
+            self._state.pop(key, None)
+            del self._ttl[key]
+            return None
+        return self._state.get(key)
 
     async def set(self, key: str, value: Any) -> None:
         """
@@ -62,10 +102,24 @@ class StateEngine:
             key: ключ
             value: значение (может быть любым типом)
         """
-        async with self._lock:
-            self._state[key] = value
-            # Удаляем TTL если был установлен (set без TTL = бессрочное хранение)
-            self._ttl.pop(key, None)
+        self._state[key] = value
+        # Удаляем TTL если был установлен (set без TTL = бессрочное хранение)
+        self._ttl.pop(key, None)
+        if self._expiry_handles:
+            self._cancel_expiry(key)
+
+    def set_nowait(self, key: str, value: Any) -> None:
+        """
+        Синхронный вариант set() для hot path внутри Core (без await).
+        
+        Args:
+            key: ключ
+            value: значение (может быть любым типом)
+        """
+        self._state[key] = value
+        self._ttl.pop(key, None)
+        if self._expiry_handles:
+            self._cancel_expiry(key)
     
     async def set_with_ttl(self, key: str, value: Any, ttl_seconds: float) -> None:
         """
@@ -80,12 +134,25 @@ class StateEngine:
             await state_engine.set_with_ttl("cache.key", {"data": "value"}, ttl_seconds=300)
             # Ключ автоматически удалится через 5 минут
         """
-        async with self._lock:
-            self._state[key] = value
-            self._ttl[key] = time.time() + ttl_seconds
-            # Запускаем фоновую задачу очистки, если ещё не запущена
-            if not self._cleanup_running:
-                self._start_cleanup_task()
+        expires_at = time.monotonic() + ttl_seconds
+        self._state[key] = value
+        self._ttl[key] = expires_at
+        if not self._auto_sweep:
+            heap = self._expiry_heap
+            heapq.heappush(heap, (expires_at, key))
+            # Перезапись ключа оставляет в heap устаревшую запись — при
+            # частом обновлении TTL heap пересобирается из _ttl
+            if len(heap) > 2 * len(self._ttl) + _HEAP_COMPACT_SLACK:
+                heap[:] = [(exp, k) for k, exp in self._ttl.items()]
+                heapq.heapify(heap)
+        else:
+            # Event loop уже является таймерной очередью — без фоновой задачи.
+            # loop.time() и time.monotonic() используют одни и те же часы.
+            self._cancel_expiry(key)
+            loop = asyncio.get_running_loop()
+            self._expiry_handles[key] = loop.call_at(
+                loop.time() + ttl_seconds, _expire_weak, self._weak_self, key, expires_at
+            )
 
     async def delete(self, key: str) -> bool:
         """
@@ -97,12 +164,12 @@ class StateEngine:
         Returns:
             True если значение было удалено
         """
-        async with self._lock:
-            if key in self._state:
-                del self._state[key]
-                self._ttl.pop(key, None)
-                return True
+        if self._state.pop(key, _MISSING) is _MISSING:
             return False
+        self._ttl.pop(key, None)
+        if self._expiry_handles:
+            self._cancel_expiry(key)
+        return True
 
     async def exists(self, key: str) -> bool:
         """
@@ -112,10 +179,17 @@ class StateEngine:
             key: ключ
             
         Returns:
-            True если ключ существует
+            True если ключ существует (и не истёк)
         """
-        async with self._lock:
+        # Fast path: ключей с TTL нет — достаточно проверки членства
+        if not self._ttl:
             return key in self._state
+        expires_at = self._ttl.get(key)
+        if expires_at is not None and time.monotonic() > expires_at:
+            self._state.pop(key, None)
+            del self._ttl[key]
+            return False
+        return key in self._state
 
     async def keys(self) -> list[str]:
         """
@@ -124,49 +198,56 @@ class StateEngine:
         Returns:
             Список ключей
         """
-        async with self._lock:
-            return list(self._state.keys())
+        if self._ttl:
+            self.sweep()
+        return list(self._state.keys())
+
+    def sweep(self) -> int:
+        """
+        Удалить все истёкшие ключи.
+
+        Нужен для ключей с TTL, к которым больше не обращаются:
+        остальные истёкшие ключи удаляются лениво при чтении.
+
+        Returns:
+            Количество удалённых ключей
+        """
+        heap = self._expiry_heap
+        now = time.monotonic()
+        removed = 0
+        while heap and heap[0][0] < now:
+            expires_at, k = heapq.heappop(heap)
+            # Пропускаем устаревшие записи heap
+            if self._ttl.get(k) == expires_at:
+                self._state.pop(k, None)
+                del self._ttl[k]
+                removed += 1
+        if not self._ttl:
+            heap.clear()
+        return removed
 
     async def clear(self) -> None:
         """Очистить всё состояние."""
-        async with self._lock:
-            self._state.clear()
-            self._ttl.clear()
-            # Останавливаем фоновую задачу очистки
-            if self._cleanup_task and not self._cleanup_task.done():
-                self._cleanup_task.cancel()
-                self._cleanup_running = False
-    
-    def _start_cleanup_task(self) -> None:
-        """Запустить фоновую задачу для очистки истёкших ключей."""
-        if self._cleanup_running:
-            return
-        
-        self._cleanup_running = True
-        
-        async def _cleanup_expired() -> None:
-            """Фоновая задача для очистки истёкших ключей."""
-            while self._cleanup_running:
-                try:
-                    await asyncio.sleep(60)  # Проверяем каждую минуту
-                    now = time.time()
-                    async with self._lock:
-                        expired = [k for k, exp in self._ttl.items() if exp < now]
-                        for k in expired:
-                            self._state.pop(k, None)
-                            del self._ttl[k]
-                        # Если больше нет ключей с TTL, останавливаем задачу
-                        if not self._ttl:
-                            self._cleanup_running = False
-                            break
-                except asyncio.CancelledError:
-                    self._cleanup_running = False
-                    break
-                except Exception:
-                    # Игнорируем ошибки в фоновой задаче
-                    pass
-        
-        self._cleanup_task = asyncio.create_task(_cleanup_expired())
+        self._state.clear()
+        self._ttl.clear()
+        self._expiry_heap.clear()
+        # Отменяем таймеры истечения
+        for handle in self._expiry_handles.values():
+            handle.cancel()
+        self._expiry_handles.clear()
+
+    def _cancel_expiry(self, key: str) -> None:
+        """Отменить таймер истечения ключа (если есть)."""
+        handle = self._expiry_handles.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+
+    def _expire(self, key: str, expires_at: float) -> None:
+        """Callback таймера: удалить ключ, если его TTL не менялся."""
+        self._expiry_handles.pop(key, None)
+        if self._ttl.get(key) == expires_at:
+            self._state.pop(key, None)
+            del self._ttl[key]
 
     async def update(self, updates: dict[str, Any]) -> None:
         """
@@ -175,5 +256,4 @@ class StateEngine:
         Args:
             updates: словарь с обновлениями
         """
-        async with self._lock:
-            self._state.update(updates)
+        self._state.update(updates)
@@ -5,12 +5,56 @@ Storage API - единый интерфейс для работы с храни
 Никакого прямого доступа к БД.
 """
 
-from typing import Any, Optional, Callable, Awaitable
-from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional, Callable, Awaitable
 
 from adapters.storage_adapter import StorageAdapter
 
 
+def _raise_invalid(namespace: Any, key: Any = None) -> None:
+    """Сформировать и выбросить ошибку валидации (холодный путь)."""
+    if type(namespace) is not str or not namespace:
+        raise ValueError(
+            f"namespace must be non-empty string, got {type(namespace).__name__}: {namespace!r}"
+        )
+    raise ValueError(
+        f"key must be non-empty string, got {type(key).__name__}: {key!r}"
+    )
+
+
+def _validate_namespace_key(namespace: Any, key: Any) -> None:
+    """Проверить namespace и key одной проверкой; форматирование — только при ошибке."""
+    if type(namespace) is not str or not namespace or type(key) is not str or not key:
+        _raise_invalid(namespace, key)
+
+
+def _validate_namespace(namespace: Any) -> None:
+    """Проверить namespace; форматирование — только при ошибке."""
+    if type(namespace) is not str or not namespace:
+        _raise_invalid(namespace)
+
+
+class _Transaction:
+    """
+    Async context manager транзакции Storage.
+    
+    Напрямую делегирует контексту адаптера — без генератора и обёртки,
+    которые создаёт @asynccontextmanager на каждый вызов.
+    """
+
+    __slots__ = ("_adapter", "_ctx")
+
+    def __init__(self, adapter: StorageAdapter):
+        self._adapter = adapter
+        self._ctx: Any = None
+
+    async def __aenter__(self) -> None:
+        self._ctx = self._adapter.transaction()
+        await self._ctx.__aenter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> Optional[bool]:
+        return await self._ctx.__aexit__(exc_type, exc, tb)
+
+
 class Storage:
     """
     Storage API для плагинов.
@@ -40,16 +84,34 @@ class Storage:
         Пример:
             value = await storage.get("devices", "lamp_1")
         """
-        if not isinstance(namespace, str) or not namespace:
-            raise ValueError(
-                f"namespace must be non-empty string, got {type(namespace).__name__}: {namespace!r}"
-            )
-        if not isinstance(key, str) or not key:
-            raise ValueError(
-                f"key must be non-empty string, got {type(key).__name__}: {key!r}"
-            )
+        _validate_namespace_key(namespace, key)
         return await self._adapter.get(namespace, key)
 
+    async def batch_get(self, namespace: str, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Массовое чтение значений из namespace.
+        
+        Выполняется одним запросом к адаптеру вместо N вызовов get().
+        
+        Args:
+            namespace: пространство имён (непустая строка)
+            keys: список ключей (непустые строки)
+            
+        Returns:
+            Словарь {key: value} только для найденных ключей
+            
+        Raises:
+            ValueError: если namespace или один из ключей пустые или не строки
+            
+        Пример:
+            values = await storage.batch_get("devices", ["lamp_1", "lamp_2"])
+        """
+        _validate_namespace(namespace)
+        for key in keys:
+            if type(key) is not str or not key:
+                _raise_invalid(namespace, key)
+        return await self._adapter.batch_get(namespace, keys)
+
     async def set(self, namespace: str, key: str, value: dict[str, Any]) -> None:
         """
         Сохранить значение.
@@ -71,14 +133,7 @@ class Storage:
             raise TypeError(
                 f"value must be dict, got {type(value).__name__}: {value}"
             )
-        if not isinstance(namespace, str) or not namespace:
-            raise ValueError(
-                f"namespace must be non-empty string, got {type(namespace).__name__}: {namespace!r}"
-            )
-        if not isinstance(key, str) or not key:
-            raise ValueError(
-                f"key must be non-empty string, got {type(key).__name__}: {key!r}"
-            )
+        _validate_namespace_key(namespace, key)
         
         await self._adapter.set(namespace, key, value)
 
@@ -96,14 +151,7 @@ class Storage:
         Raises:
             ValueError: если namespace или key пустые или не строки
         """
-        if not isinstance(namespace, str) or not namespace:
-            raise ValueError(
-                f"namespace must be non-empty string, got {type(namespace).__name__}: {namespace!r}"
-            )
-        if not isinstance(key, str) or not key:
-            raise ValueError(
-                f"key must be non-empty string, got {type(key).__name__}: {key!r}"
-            )
+        _validate_namespace_key(namespace, key)
         return await self._adapter.delete(namespace, key)
 
     async def list_keys(self, namespace: str) -> list[str]:
@@ -122,12 +170,37 @@ class Storage:
         Пример:
             keys = await storage.list_keys("devices")
         """
-        if not isinstance(namespace, str) or not namespace:
-            raise ValueError(
-                f"namespace must be non-empty string, got {type(namespace).__name__}: {namespace!r}"
-            )
+        _validate_namespace(namespace)
         return await self._adapter.list_keys(namespace)
 
+    async def iter_keys(
+        self,
+        namespace: str,
+        prefix: str = "",
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Итерировать ключи namespace без загрузки всего списка в память.
+        
+        Args:
+            namespace: пространство имён (непустая строка)
+            prefix: вернуть только ключи с этим префиксом
+            limit: максимальное количество ключей (None — без ограничения)
+            
+        Yields:
+            Ключи в порядке сортировки
+            
+        Raises:
+            ValueError: если namespace пустой или не строка
+            
+        Пример:
+            async for key in storage.iter_keys("devices", prefix="lamp_"):
+                ...
+        """
+        _validate_namespace(namespace)
+        async for key in self._adapter.iter_keys(namespace, prefix, limit):
+            yield key
+
     async def clear_namespace(self, namespace: str) -> None:
         """Очистить все записи в namespace."""
         await self._adapter.clear_namespace(namespace)
@@ -136,8 +209,7 @@ class Storage:
         """Закрыть соединение."""
         await self._adapter.close()
     
-    @asynccontextmanager
-    async def transaction(self):
+    def transaction(self) -> "_Transaction":
         """
         Контекстный менеджер для транзакций.
         
@@ -152,8 +224,7 @@ class Storage:
         Yields:
             None (контекстный менеджер для управления транзакцией)
         """
-        async with self._adapter.transaction():
-            yield
+        return _Transaction(self._adapter)
     
     async def transaction_callback(self, callback: Callable[["Storage"], Awaitable[Any]]) -> Any:
         """
@@ -197,10 +268,7 @@ class Storage:
                 "device2": {"name": "Lamp 2", "state": "off"}
             })
         """
-        if not isinstance(namespace, str) or not namespace:
-            raise ValueError(
-                f"namespace must be non-empty string, got {type(namespace).__name__}: {namespace!r}"
-            )
+        _validate_namespace(namespace)
         if not isinstance(items, dict):
             raise TypeError(f"items must be dict, got {type(items).__name__}")
         
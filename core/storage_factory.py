@@ -4,12 +4,55 @@
 Позволяет создавать разные адаптеры (SQLite, PostgreSQL) на основе конфигурации.
 """
 
-from typing import Any
+from typing import Awaitable, Callable
 
 from core.config import Config
 from adapters.storage_adapter import StorageAdapter
 
 
+# Фабрика адаптера: принимает конфигурацию, возвращает инициализированный адаптер
+AdapterFactory = Callable[[Config], Awaitable[StorageAdapter]]
+
+# Таблица диспетчеризации: storage_type -> фабрика адаптера
+_ADAPTER_FACTORIES: dict[str, AdapterFactory] = {}
+
+
+def _register_adapter(storage_type: str) -> Callable[[AdapterFactory], AdapterFactory]:
+    """Декоратор регистрации фабрики адаптера для storage_type."""
+    def decorator(factory: AdapterFactory) -> AdapterFactory:
+        _ADAPTER_FACTORIES[storage_type] = factory
+        return factory
+    return decorator
+
+
+@_register_adapter("sqlite")
+async def _create_sqlite_adapter(config: Config) -> StorageAdapter:
+    from adapters.sqlite_adapter import SQLiteAdapter
+    adapter = SQLiteAdapter(
+        config.db_path,
+        synchronous=config.sqlite_synchronous,
+        cache_size_kb=config.sqlite_cache_size_kb,
+        mmap_size=config.sqlite_mmap_size,
+    )
+    await adapter.initialize_schema()
+    return adapter
+
+
+@_register_adapter("postgresql")
+async def _create_postgresql_adapter(config: Config) -> StorageAdapter:
+    from adapters.postgresql_adapter import PostgreSQLAdapter
+    adapter = PostgreSQLAdapter(
+        host=config.pg_host,
+        port=config.pg_port,
+        database=config.pg_database,
+        user=config.pg_user,
+        password=config.pg_password,
+        dsn=config.pg_dsn,
+    )
+    await adapter.initialize_schema()
+    return adapter
+
+
 async def create_storage_adapter(config: Config) -> StorageAdapter:
     """
     Создать storage адаптер на основе конфигурации.
@@ -26,28 +69,11 @@ async def create_storage_adapter(config: Config) -> StorageAdapter:
     """
     # Валидируем конфигурацию перед созданием адаптера
     config.validate()
-    
-    if config.storage_type == "sqlite":
-        from adapters.sqlite_adapter import SQLiteAdapter
-        adapter = SQLiteAdapter(config.db_path)
-        await adapter.initialize_schema()
-        return adapter
-
-    elif config.storage_type == "postgresql":
-        from adapters.postgresql_adapter import PostgreSQLAdapter
-        adapter = PostgreSQLAdapter(
-            host=config.pg_host,
-            port=config.pg_port,
-            database=config.pg_database,
-            user=config.pg_user,
-            password=config.pg_password,
-            dsn=config.pg_dsn,
-        )
-        await adapter.initialize_schema()
-        return adapter
 
-    else:
+    factory = _ADAPTER_FACTORIES.get(config.storage_type)
+    if factory is None:
         raise ValueError(
             f"Неизвестный тип storage: {config.storage_type}. "
-            f"Доступные типы: sqlite, postgresql"
+            f"Доступные типы: {', '.join(_ADAPTER_FACTORIES)}"
         )
+    return await factory(config)
@@ -5,12 +5,36 @@ StorageWithStateMirror - обёртка для синхронизации Storag
 и in-memory state_engine (read-only cache).
 """
 
-from typing import Any
+from typing import Any, AsyncIterator, Optional
+import asyncio
+import copy
+import functools
+import sys
+import time
 
-from core.storage import Storage
+from core.storage import Storage, _validate_namespace_key
 from core.state_engine import StateEngine
 
 
+# Время жизни записи read-through кеша (значение или отсутствие ключа), секунды.
+# Записи в ту же БД из других процессов становятся видны не позже чем через TTL
+_CACHE_TTL = 1.0
+# Максимальный размер read-through кеша (при превышении очищается целиком)
+_CACHE_MAX = 4096
+
+
+@functools.lru_cache(maxsize=8192)
+def _state_key(namespace: str, key: str) -> str:
+    """Ключ зеркала в state_engine; кешируется и интернируется на (namespace, key)."""
+    return sys.intern(f"{namespace}.{key}")
+
+
+def _consume_future_exception(fut: asyncio.Future) -> None:
+    """Пометить исключение single-flight загрузки как прочитанное."""
+    if not fut.cancelled():
+        fut.exception()
+
+
 class StorageWithStateMirror:
     """
     Обёртка для Storage, которая автоматически синхронизирует изменения
@@ -18,33 +42,161 @@ class StorageWithStateMirror:
     
     Формат ключей в state_engine: f"{namespace}.{key}"
     
+    Чтение идёт через собственный read-through кеш по (namespace, key),
+    отдельный от зеркала в state_engine: найденные и отсутствующие ключи
+    запоминаются на _CACHE_TTL секунд. Одновременные промахи по одному
+    ключу объединяются в один запрос к storage (single-flight).
+    get()/batch_get() возвращают копии — изменение результата не влияет
+    на кеш.
+    
     Гарантирует консистентность: если операция с storage падает,
     state_engine не обновляется.
+    
+    Значения копируются на границах обёртки: в state_engine и write-back
+    буфер попадает копия переданного в set() dict, а get() возвращает копию
+    из кеша. Вызывающий может изменять свои значения без последующего set().
+    
+    Опциональный write-back режим (write_back_delay) для высокочастотных
+    записей: set() сразу обновляет state_engine (read-your-writes), а запись
+    в storage откладывается и выполняется пачкой через batch_set.
     """
     
-    def __init__(self, storage: Storage, state_engine: StateEngine):
+    def __init__(
+        self,
+        storage: Storage,
+        state_engine: StateEngine,
+        write_back_delay: float | None = None,
+    ):
         """
         Инициализация обёртки.
         
         Args:
             storage: экземпляр Storage (source of truth)
             state_engine: экземпляр StateEngine (read-only cache)
+            write_back_delay: окно накопления записей в секундах (например, 0.005).
+                              None — write-back выключен, set() пишет в storage сразу.
         """
         self._storage = storage
         self._state_engine = state_engine
+        # Write-back буфер: namespace -> {key: value}
+        self._write_back_delay = write_back_delay
+        self._pending: dict[str, dict[str, dict[str, Any]]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+        # Read-through кеш: (namespace, key) -> (deadline по time.monotonic, value или None)
+        self._cache: dict[tuple[str, str], tuple[float, Optional[dict[str, Any]]]] = {}
+        # Счётчик записей: batch_get не кеширует результат, если во время
+        # загрузки была запись
+        self._writes = 0
+        # Single-flight: (namespace, key) -> Task текущей загрузки из storage
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
 
     async def get(self, namespace: str, key: str) -> Any:
         """
-        Получить значение из storage.
+        Получить значение: из read-through кеша, при промахе — из storage.
         
         Args:
             namespace: пространство имён
             key: ключ
             
         Returns:
-            Значение из storage
+            Копия значения или None если не найдено
+        """
+        if self._pending:
+            # Write-back: ещё не записанное значение (read-your-writes)
+            value = self._pending.get(namespace, {}).get(key)
+            if value is not None:
+                return copy.deepcopy(value)
+        cache_key = (namespace, key)
+        entry = self._cache.get(cache_key)
+        if entry is not None:
+            deadline, value = entry
+            if time.monotonic() < deadline:
+                return copy.deepcopy(value)
+            del self._cache[cache_key]
+
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._load(namespace, key))
+            # Исключение может быть никем не прочитано — помечаем как обработанное
+            task.add_done_callback(_consume_future_exception)
+            self._inflight[cache_key] = task
+        # shield: отмена любого ожидающего (включая инициатора) не отменяет
+        # общую загрузку и не затрагивает остальных ожидающих
+        return copy.deepcopy(await asyncio.shield(task))
+
+    async def _load(self, namespace: str, key: str) -> Any:
+        """Загрузка ключа из storage для single-flight get()."""
+        cache_key = (namespace, key)
+        task = asyncio.current_task()
+        try:
+            value = await self._storage.get(namespace, key)
+        finally:
+            # Кешируем только если загрузку не вытеснила запись (set/delete/clear)
+            current = self._inflight.get(cache_key) is task
+            if current:
+                del self._inflight[cache_key]
+        if current:
+            self._cache_put(cache_key, value)
+        return value
+
+    def _cache_put(self, cache_key: tuple[str, str], value: Optional[dict[str, Any]]) -> None:
+        """Запомнить загруженное из storage значение (или его отсутствие) на _CACHE_TTL."""
+        if len(self._cache) >= _CACHE_MAX:
+            self._cache.clear()
+        self._cache[cache_key] = (time.monotonic() + _CACHE_TTL, value)
+
+    def _invalidate(self, namespace: str, key: str) -> None:
+        """Сбросить кеш и незавершённую загрузку ключа при записи."""
+        self._writes += 1
+        cache_key = (namespace, key)
+        self._cache.pop(cache_key, None)
+        # Незавершённая загрузка устарела — её результат не попадёт в кеш
+        self._inflight.pop(cache_key, None)
+
+    def _invalidate_namespace(self, namespace: str) -> None:
+        """Сбросить кеш и незавершённые загрузки namespace при его очистке."""
+        self._writes += 1
+        for cache_key in [k for k in self._inflight if k[0] == namespace]:
+            del self._inflight[cache_key]
+        for cache_key in [k for k in self._cache if k[0] == namespace]:
+            del self._cache[cache_key]
+
+    async def batch_get(self, namespace: str, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Массовое чтение: сначала из read-through кеша, промахи — одним запросом к storage.
+        
+        Args:
+            namespace: пространство имён
+            keys: список ключей
+            
+        Returns:
+            Словарь {key: копия value} только для найденных ключей
         """
-        return await self._storage.get(namespace, key)
+        result: dict[str, dict[str, Any]] = {}
+        missing: list[str] = []
+        pending = self._pending.get(namespace, {}) if self._pending else {}
+        now = time.monotonic()
+        for key in keys:
+            value = pending.get(key)
+            if value is not None:
+                result[key] = copy.deepcopy(value)
+                continue
+            entry = self._cache.get((namespace, key))
+            if entry is None or now >= entry[0]:
+                missing.append(key)
+            elif entry[1] is not None:
+                result[key] = copy.deepcopy(entry[1])
+        if missing:
+            writes = self._writes
+            loaded = await self._storage.batch_get(namespace, missing)
+            if writes == self._writes:
+                for key in missing:
+                    self._cache_put((namespace, key), loaded.get(key))
+                loaded = copy.deepcopy(loaded)
+            result.update(loaded)
+        return result
 
     async def set(self, namespace: str, key: str, value: dict[str, Any]) -> None:
         """
@@ -62,20 +214,126 @@ class StorageWithStateMirror:
             TypeError: если value не является dict (пробрасывается из Storage.set)
             ValueError: если namespace или key невалидны (пробрасывается из Storage.set)
         """
-        state_key = f"{namespace}.{key}"
+        state_key = _state_key(namespace, key)
+        self._invalidate(namespace, key)
+        if self._write_back_delay is not None:
+            self._set_write_back(namespace, key, state_key, value)
+            return
         try:
             # Сначала сохраняем в storage (source of truth)
             await self._storage.set(namespace, key, value)
-            # Только после успешного сохранения обновляем state_engine
-            await self._state_engine.set(state_key, value)
         except Exception:
-            # Если storage.set() упал, откатываем state_engine (если был обновлён)
+            # Если storage.set() упал, сбрасываем зеркало — следующее чтение
+            # загрузит актуальное значение из storage
             try:
                 await self._state_engine.delete(state_key)
             except Exception:
                 pass
             # Пробрасываем оригинальную ошибку
             raise
+        # Значение, загруженное в кеш во время записи, уже устарело
+        self._invalidate(namespace, key)
+        # Только после успешного сохранения обновляем state_engine — синхронно,
+        # без лишнего await-перехода на пути записи
+        self._state_engine.set_nowait(state_key, copy.deepcopy(value))
+
+    async def batch_set(self, namespace: str, items: dict[str, dict[str, Any]]) -> None:
+        """
+        Массовая запись в storage одним batch_set с синхронизацией state_engine.
+        
+        Гарантирует консистентность как set(): при ошибке storage зеркала
+        записанных ключей сбрасываются.
+        
+        Args:
+            namespace: пространство имён
+            items: словарь {key: value}, где value - это dict с данными
+            
+        Raises:
+            TypeError: если items или значения не dict (пробрасывается из Storage.batch_set)
+            ValueError: если namespace невалиден (пробрасывается из Storage.batch_set)
+        """
+        if not isinstance(items, dict):
+            raise TypeError(f"items must be dict, got {type(items).__name__}")
+        state_keys = [_state_key(namespace, key) for key in items]
+        for key in items:
+            self._invalidate(namespace, key)
+        if self._write_back_delay is not None:
+            for (key, value), state_key in zip(items.items(), state_keys):
+                self._set_write_back(namespace, key, state_key, value)
+            return
+        try:
+            await self._storage.batch_set(namespace, items)
+        except Exception:
+            for state_key in state_keys:
+                try:
+                    await self._state_engine.delete(state_key)
+                except Exception:
+                    pass
+            raise
+        for key, value, state_key in zip(items, items.values(), state_keys):
+            self._invalidate(namespace, key)
+            self._state_engine.set_nowait(state_key, copy.deepcopy(value))
+
+    def _set_write_back(self, namespace: str, key: str, state_key: str, value: dict[str, Any]) -> None:
+        """Записать значение в state_engine и поставить запись в storage в очередь."""
+        # Валидируем сразу: отложенный batch_set не должен падать из-за аргументов
+        if not isinstance(value, dict):
+            raise TypeError(
+                f"value must be dict, got {type(value).__name__}: {value}"
+            )
+        _validate_namespace_key(namespace, key)
+        value = copy.deepcopy(value)
+        self._state_engine.set_nowait(state_key, value)
+        self._pending.setdefault(namespace, {})[key] = value
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self._write_back_delay, self._on_flush_timer)
+
+    def _on_flush_timer(self) -> None:
+        """Callback таймера write-back: запускает фоновый flush."""
+        self._flush_handle = None
+        self._flush_task = asyncio.create_task(self._flush_in_background())
+
+    async def _flush_in_background(self) -> None:
+        """Фоновый flush; при ошибке записи остаются в буфере и повторяются позже."""
+        try:
+            await self.flush()
+        except Exception as e:
+            import sys
+            print(
+                f"[StorageWithStateMirror] Ошибка write-back flush: {e}",
+                file=sys.stderr
+            )
+            if self._pending and self._flush_handle is None:
+                loop = asyncio.get_running_loop()
+                self._flush_handle = loop.call_later(self._write_back_delay, self._on_flush_timer)
+
+    async def flush(self) -> None:
+        """
+        Записать накопленные write-back значения в storage.
+        
+        Выполняется по одному batch_set на namespace. Без write-back режима
+        ничего не делает.
+        
+        Raises:
+            Exception: ошибка storage (не записанные значения остаются в буфере)
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        async with self._flush_lock:
+            # Значения остаются в буфере до записи: get() видит их и во время
+            # flush, а при ошибке storage они повторяются следующим flush
+            for namespace in list(self._pending):
+                items = self._pending[namespace]
+                batch = dict(items)
+                await self._storage.batch_set(namespace, batch)
+                for key, value in batch.items():
+                    # Более новое значение, записанное во время flush, остаётся в буфере
+                    if items.get(key) is value:
+                        del items[key]
+                if not items:
+                    del self._pending[namespace]
 
     async def delete(self, namespace: str, key: str) -> bool:
         """
@@ -91,10 +349,15 @@ class StorageWithStateMirror:
         Returns:
             True если запись была удалена
         """
-        state_key = f"{namespace}.{key}"
+        state_key = _state_key(namespace, key)
+        self._invalidate(namespace, key)
+        if self._pending:
+            # Отложенные записи должны попасть в storage до удаления
+            await self.flush()
         try:
             # Сначала удаляем из storage
             res = await self._storage.delete(namespace, key)
+            self._invalidate(namespace, key)
             # Только после успешного удаления обновляем state_engine
             if res:
                 await self._state_engine.delete(state_key)
@@ -114,17 +377,50 @@ class StorageWithStateMirror:
         Returns:
             Список ключей
         """
+        if self._pending:
+            await self.flush()
         return await self._storage.list_keys(namespace)
 
+    async def iter_keys(
+        self,
+        namespace: str,
+        prefix: str = "",
+        limit: int | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Итерировать ключи namespace постранично (см. Storage.iter_keys).
+        
+        Args:
+            namespace: пространство имён
+            prefix: вернуть только ключи с этим префиксом
+            limit: максимальное количество ключей (None — без ограничения)
+        """
+        if self._pending:
+            await self.flush()
+        async for key in self._storage.iter_keys(namespace, prefix, limit):
+            yield key
+
     async def clear_namespace(self, namespace: str) -> None:
         """
-        Очистить все записи в namespace.
+        Очистить все записи в namespace и их зеркала в state_engine.
         
         Args:
             namespace: пространство имён
         """
-        return await self._storage.clear_namespace(namespace)
+        if self._pending:
+            await self.flush()
+        self._invalidate_namespace(namespace)
+        await self._storage.clear_namespace(namespace)
+        self._invalidate_namespace(namespace)
+        prefix = f"{namespace}."
+        for state_key in await self._state_engine.keys():
+            # Зеркальные значения — всегда dict; прочее состояние не трогаем
+            if state_key.startswith(prefix) and isinstance(
+                await self._state_engine.get(state_key), dict
+            ):
+                await self._state_engine.delete(state_key)
 
     async def close(self) -> None:
-        """Закрыть соединение с storage."""
+        """Записать отложенные значения и закрыть соединение с storage."""
+        await self.flush()
         return await self._storage.close()
@@ -0,0 +1,41 @@
+"""
+Bootstrap Core Runtime для dev-scripts и утилит.
+
+Повторяет инициализацию из main.py: конфигурация → storage адаптер
+(со схемой) → CoreRuntime.
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Optional
+
+from core.config import Config
+from core.runtime import CoreRuntime
+from core.storage_factory import create_storage_adapter
+
+
+async def bootstrap_runtime(config: Optional[Config] = None) -> CoreRuntime:
+    """
+    Создать CoreRuntime с инициализированным storage адаптером.
+
+    Runtime не запускается — start() вызывает вызывающая сторона.
+    Повторная инициализация схемы SQLite дешёвая: адаптер пропускает DDL,
+    если версия схемы в БД (PRAGMA user_version) уже актуальна.
+
+    Args:
+        config: конфигурация (по умолчанию Config.from_env())
+
+    Returns:
+        экземпляр CoreRuntime
+    """
+    if config is None:
+        config = Config.from_env()
+
+    # Создать директорию для БД, если нужно (только для SQLite)
+    if config.storage_type == "sqlite" and config.db_path != ":memory:":
+        await asyncio.to_thread(
+            Path(config.db_path).parent.mkdir, parents=True, exist_ok=True
+        )
+
+    storage_adapter = await create_storage_adapter(config)
+    return CoreRuntime(storage_adapter, config=config)
@@ -4,20 +4,258 @@ Helper для system-level операций с четкими границами
 Использует operation_id из request_logger для группировки логов.
 """
 
-import uuid
-from contextlib import asynccontextmanager
+import asyncio
+import collections
+import functools
+import logging
+import os
+import random
+import sys
+import weakref
 from typing import Optional, Any
 
-from modules.request_logger.middleware import get_operation_id, set_operation_id
+from modules.request_logger.middleware import push_operation_id, reset_operation_id
 
 
-@asynccontextmanager
-async def operation(name: str, source: str, runtime: Optional[Any] = None):
+# Размер пачки заранее сгенерированных operation_id
+_ID_POOL_SIZE = 256
+# Пул готовых operation_id; пополняется пачкой, когда опустеет
+_ID_POOL: "collections.deque[str]" = collections.deque()
+# Старший hex-символ 4-й группы UUID4 -> символ с битами варианта RFC 4122 (10xx)
+_VARIANT_CHARS = {c: "89ab"[int(c, 16) & 3] for c in "0123456789abcdef"}
+
+# Дочерний процесс не должен выдавать те же operation_id, что и родитель
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_ID_POOL.clear)
+
+
+# Сообщения (start, ok, error) для операций со специальными текстами логов
+_OP_MESSAGES: dict[str, tuple[str, str, str]] = {
+    "oauth.refresh_token": ("Refreshing OAuth token", "OAuth token refreshed", "OAuth token refresh failed"),
+}
+_DEFAULT_MESSAGES = ("operation.start", "operation.ok", "operation.error")
+
+# Префиксы операций, для которых регистрируются request_metadata (операции
+# с внешними системами, видимые в трассировке request_logger). Остальные
+# операции не тратят на это await и сборку dict.
+_METADATA_PREFIXES = ("oauth.", "yandex.", "external.")
+
+
+# Кеш наличия сервисов: runtime -> {service_name: bool}
+_SERVICE_PRESENCE: "weakref.WeakKeyDictionary[Any, dict[str, bool]]" = weakref.WeakKeyDictionary()
+
+
+async def _has_service(runtime: Any, service_name: str) -> bool:
+    """
+    Проверить наличие сервиса с кешированием на время жизни runtime.
+
+    Результат кешируется только для запущенного runtime: до start()
+    встроенные модули ещё не зарегистрировали свои сервисы.
+    """
+    presence = _SERVICE_PRESENCE.get(runtime)
+    if presence is None:
+        presence = {}
+        _SERVICE_PRESENCE[runtime] = presence
+    flag = presence.get(service_name)
+    if flag is None:
+        flag = await runtime.service_registry.has_service(service_name)
+        if getattr(runtime, "is_running", False):
+            presence[service_name] = flag
+    return flag
+
+
+# Фоновые задачи логирования операций: сильные ссылки, чтобы задачи
+# не были собраны сборщиком мусора до завершения
+_LOG_TASKS: set[asyncio.Task] = set()
+
+
+def _on_log_task_done(task: asyncio.Task) -> None:
+    """Убрать завершённую задачу логирования; ошибки логирования игнорируются."""
+    _LOG_TASKS.discard(task)
+    if not task.cancelled():
+        task.exception()
+
+
+# Кеш эффективного уровня logger.log: runtime -> уровень logging
+_LOG_LEVELS: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+
+
+async def _info_enabled(runtime: Any) -> bool:
+    """
+    Проверить, пропускает ли logger.log сообщения уровня info.
+
+    Уровень кешируется для запущенного runtime (как в _has_service).
+    Без сервиса logger.get_effective_level считается, что info включён.
+    """
+    level = _LOG_LEVELS.get(runtime)
+    if level is None:
+        get_level = runtime.service_registry.get_callable("logger.get_effective_level")
+        try:
+            level = await get_level() if get_level is not None else logging.NOTSET
+        except Exception:
+            level = logging.NOTSET
+        if getattr(runtime, "is_running", False):
+            _LOG_LEVELS[runtime] = level
+    return level <= logging.INFO
+
+
+@functools.lru_cache(maxsize=1024)
+def _metadata_paths(source: str, name: str) -> tuple[str, str]:
+    """URL и path request_metadata system операции; кешируются на (source, name)."""
+    return f"system://{source}/{name}", f"/system/{source}/{name}"
+
+
+def _refill_id_pool() -> None:
+    """
+    Пополнить пул operation_id пачкой UUID4.
+
+    operation_id — некриптографический токен корреляции логов, поэтому
+    случайные байты для всей пачки берутся одним вызовом random.randbytes
+    (без syscall и без создания объектов uuid.UUID).
+    """
+    raw = random.randbytes(16 * _ID_POOL_SIZE).hex()
+    append = _ID_POOL.append
+    for i in range(0, len(raw), 32):
+        h = raw[i:i + 32]
+        append(f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{_VARIANT_CHARS[h[16]]}{h[17:20]}-{h[20:]}")
+
+
+def _new_operation_id() -> str:
+    """Сгенерировать operation_id в формате UUID4 (из пула)."""
+    try:
+        return _ID_POOL.popleft()
+    except IndexError:
+        _refill_id_pool()
+        return _ID_POOL.popleft()
+
+
+class _Operation:
+    """
+    Async context manager system-level операции (см. operation()).
+
+    Реализован классом, а не через @asynccontextmanager: без генератора
+    и обёртки _AsyncGeneratorContextManager на каждый вызов.
+    """
+
+    __slots__ = (
+        "_name", "_source", "_runtime", "_token", "_log", "_info_enabled",
+        "_messages", "_base_kwargs",
+    )
+
+    def __init__(self, name: str, source: str, runtime: Optional[Any]):
+        # Имена операций повторяются миллионы раз — интернируем, чтобы поиск
+        # в _OP_MESSAGES и сравнения по ним сводились к сравнению указателей
+        self._name = sys.intern(name)
+        self._source = sys.intern(source)
+        self._runtime = runtime
+
+    async def __aenter__(self) -> str:
+        name = self._name
+        source = self._source
+        runtime = self._runtime
+
+        # ВСЕГДА создаем новый operation_id для system операций
+        # Даже если operation() вызывается внутри HTTP запроса,
+        # system операция должна иметь свой собственный operation_id с origin="system"
+        operation_id = _new_operation_id()
+
+        # Устанавливаем новый operation_id для этой system операции; Token
+        # позволяет при выходе вернуть предыдущий (например, от HTTP запроса)
+        self._token = push_operation_id(operation_id)
+
+        try:
+            # Функция logger.log захватывается один раз — без диспетчеризации
+            # service_registry.call() на каждом логе операции
+            log = self._log = runtime.service_registry.get_callable("logger.log") if runtime else None
+
+            # Сообщения и общие поля логов вычисляются один раз на операцию
+            self._messages = _OP_MESSAGES.get(name, _DEFAULT_MESSAGES)
+            self._base_kwargs = {
+                "plugin": source,
+                "operation_id": operation_id,  # Явно передаем operation_id как отдельный параметр
+                "operation_name": name,
+                "source": source,
+                "origin": "system",  # Явно помечаем как system операцию
+            }
+
+            # start/ok пишутся с уровнем info — пропускаем их, если logger их отбросит.
+            # Ошибки логируются всегда.
+            self._info_enabled = log is not None and await _info_enabled(runtime)
+
+            if runtime and name.startswith(_METADATA_PREFIXES):
+                # Создаем request_metadata для system операций (чтобы origin был доступен в метаданных)
+                try:
+                    has_request_logger = await _has_service(runtime, "request_logger.set_request_metadata")
+                    if has_request_logger:
+                        url, path = _metadata_paths(source, name)
+                        await runtime.service_registry.call(
+                            "request_logger.set_request_metadata",
+                            request_id=operation_id,
+                            request_metadata={
+                                "method": "SYSTEM",
+                                "url": url,
+                                "path": path,
+                                "direction": "outgoing",
+                                "origin": "system",  # Явно помечаем как system операцию
+                            }
+                        )
+                except Exception:
+                    pass  # Игнорируем ошибки создания метаданных
+
+            # Логируем начало операции; без зарегистрированного logger.log
+            # логирование пропускается целиком
+            if self._info_enabled:
+                self._emit("info", self._messages[0])
+        except BaseException:
+            # __aexit__ не будет вызван — восстанавливаем operation_id здесь
+            reset_operation_id(self._token)
+            raise
+
+        return operation_id
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        try:
+            if exc_type is None:
+                # Успешное завершение
+                if self._info_enabled:
+                    self._emit("info", self._messages[1])
+            elif issubclass(exc_type, Exception) and self._log is not None:
+                # Ошибка при выполнении операции
+                self._emit("error", self._messages[2], error=str(exc), error_type=exc_type.__name__)
+        finally:
+            # Восстанавливаем предыдущий operation_id (например, от HTTP запроса)
+            # Это важно, чтобы логи после operation() снова группировались с HTTP запросом
+            reset_operation_id(self._token)
+        # Исключение пробрасывается дальше
+        return False
+
+    def _emit(self, level: str, message: str, **extra: Any) -> None:
+        """
+        Записать лог операции в фоне, не задерживая саму операцию.
+
+        Задачи выполняются в порядке создания, поэтому start/ok/error
+        попадают в лог по порядку. При аварийном завершении процесса
+        последние записи могут быть потеряны.
+
+        Единственная точка логирования операции: ошибки логирования
+        не влияют на операцию.
+        """
+        try:
+            task = asyncio.create_task(
+                self._log(level=level, message=message, **self._base_kwargs, **extra)
+            )
+        except Exception:
+            return
+        _LOG_TASKS.add(task)
+        task.add_done_callback(_on_log_task_done)
+
+
+def operation(name: str, source: str, runtime: Optional[Any] = None) -> _Operation:
     """
     Async context manager для system-level операций.
     
     При входе:
-    - Если operation_id не установлен → создает новый UUID и set_operation_id()
+    - Создает новый UUID и устанавливает его как operation_id контекста
     - Записывает лог "operation.start"
     
     При успешном выходе:
@@ -36,106 +274,4 @@ async def operation(name: str, source: str, runtime: Optional[Any] = None):
         async with operation("yandex.check_online", "yandex_smart_home", runtime):
             await check_devices_online()
     """
-    # ВСЕГДА создаем новый operation_id для system операций
-    # Даже если operation() вызывается внутри HTTP запроса,
-    # system операция должна иметь свой собственный operation_id с origin="system"
-    new_operation_id = str(uuid.uuid4())
-    
-    # Сохраняем текущий operation_id (может быть от HTTP запроса)
-    previous_operation_id = get_operation_id()
-    
-    # Устанавливаем новый operation_id для этой system операции
-    set_operation_id(new_operation_id)
-    operation_id = new_operation_id
-    
-    # Логируем начало операции
-    if runtime:
-        try:
-            # Создаем request_metadata для system операций (чтобы origin был доступен в метаданных)
-            try:
-                has_request_logger = await runtime.service_registry.has_service("request_logger.set_request_metadata")
-                if has_request_logger:
-                    await runtime.service_registry.call(
-                        "request_logger.set_request_metadata",
-                        request_id=operation_id,
-                        request_metadata={
-                            "method": "SYSTEM",
-                            "url": f"system://{source}/{name}",
-                            "path": f"/system/{source}/{name}",
-                            "direction": "outgoing",
-                            "origin": "system",  # Явно помечаем как system операцию
-                        }
-                    )
-            except Exception:
-                pass  # Игнорируем ошибки создания метаданных
-            
-            # Специальные сообщения для oauth.refresh_token
-            if name == "oauth.refresh_token":
-                message = "Refreshing OAuth token"
-            else:
-                message = "operation.start"
-            await runtime.service_registry.call(
-                "logger.log",
-                level="info",
-                message=message,
-                plugin=source,
-                operation_id=operation_id,  # Явно передаем operation_id как отдельный параметр
-                operation_name=name,
-                source=source,
-                origin="system",  # Явно помечаем как system операцию
-            )
-        except Exception:
-            pass
-    
-    try:
-        yield operation_id
-        # Успешное завершение
-        if runtime:
-            try:
-                # Специальные сообщения для oauth.refresh_token
-                if name == "oauth.refresh_token":
-                    message = "OAuth token refreshed"
-                else:
-                    message = "operation.ok"
-                await runtime.service_registry.call(
-                    "logger.log",
-                    level="info",
-                    message=message,
-                    plugin=source,
-                    operation_id=operation_id,  # Явно передаем operation_id как отдельный параметр
-                    operation_name=name,
-                    source=source,
-                    origin="system",  # Явно помечаем как system операцию
-                )
-            except Exception:
-                pass
-    except Exception as e:
-        # Ошибка при выполнении операции
-        if runtime:
-            try:
-                # Специальные сообщения для oauth.refresh_token
-                if name == "oauth.refresh_token":
-                    message = "OAuth token refresh failed"
-                else:
-                    message = "operation.error"
-                await runtime.service_registry.call(
-                    "logger.log",
-                    level="error",
-                    message=message,
-                    plugin=source,
-                    operation_id=operation_id,  # Явно передаем operation_id как отдельный параметр
-                    operation_name=name,
-                    source=source,
-                    error=str(e),
-                    error_type=type(e).__name__,
-                    origin="system",  # Явно помечаем как system операцию
-                )
-            except Exception:
-                pass
-        # Пробрасываем исключение дальше
-        raise
-    finally:
-        # Восстанавливаем предыдущий operation_id (например, от HTTP запроса)
-        # Это важно, чтобы логи после operation() снова группировались с HTTP запросом
-        if previous_operation_id:
-            set_operation_id(previous_operation_id)
+    return _Operation(name, source, runtime)
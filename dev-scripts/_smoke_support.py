@@ -0,0 +1,113 @@
+"""
+Общие заглушки для smoke-скриптов dev-scripts/.
+
+Скрипты запускаются как `python dev-scripts/<script>.py`, поэтому каталог
+dev-scripts/ уже находится в sys.path и модуль импортируется напрямую:
+    from _smoke_support import SimpleMemoryStorage
+"""
+import io
+import sys
+from collections import defaultdict
+from contextlib import contextmanager, redirect_stdout
+from typing import Any, Callable, DefaultDict, Dict, Optional, Set, Tuple
+
+try:
+    import uvloop
+except ImportError:  # uvloop — опциональная dev-зависимость
+    uvloop = None
+
+
+_MISSING = object()
+
+# loop_factory для asyncio.Runner: uvloop, если установлен, иначе стандартный loop
+LOOP_FACTORY: Optional[Callable[[], Any]] = uvloop.new_event_loop if uvloop else None
+
+
+@contextmanager
+def buffered_output():
+    """Собрать весь stdout сценария в буфер и вывести одной записью в конце.
+
+    Вывод сбрасывается и при исключении — до печати traceback.
+    """
+    buf = io.StringIO()
+    try:
+        with redirect_stdout(buf):
+            yield
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+
+class SimpleMemoryStorage:
+    def __init__(self):
+        # Плоский словарь (namespace, key) -> value: один hash-lookup на операцию
+        self._data: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # Индекс ключей по namespace для list_keys/clear_namespace
+        self._ns_index: DefaultDict[str, Set[str]] = defaultdict(set)
+
+    async def get(self, namespace: str, key: str) -> Optional[dict]:
+        return self._data.get((namespace, key))
+
+    async def set(self, namespace: str, key: str, value: dict) -> None:
+        self._data[(namespace, key)] = value
+        self._ns_index[namespace].add(key)
+
+    async def delete(self, namespace: str, key: str) -> bool:
+        if self._data.pop((namespace, key), _MISSING) is _MISSING:
+            return False
+        self._ns_index[namespace].discard(key)
+        return True
+
+    async def list_keys(self, namespace: str) -> list:
+        return list(self._ns_index.get(namespace, ()))
+
+    async def clear_namespace(self, namespace: str) -> None:
+        for key in self._ns_index.pop(namespace, ()):
+            del self._data[(namespace, key)]
+
+    async def close(self) -> None:
+        pass
+
+
+class MockAsyncContextManager:
+    """Mock для aiohttp.ClientSession.get() context manager."""
+    def __init__(self, response):
+        self.response = response
+    
+    async def __aenter__(self):
+        return self.response
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class MockRuntime:
+    """Mock runtime for testing."""
+    
+    def __init__(self):
+        self.storage_data = {}
+        self.storage = self
+        self.event_bus = self
+        self.service_registry = self
+    
+    async def set(self, namespace: str, key: str, value):
+        """Mock storage set."""
+        self.storage_data[(namespace, key)] = value
+        print(f"✓ Storage SET: {namespace}/{key}")
+    
+    async def get(self, namespace: str, key: str):
+        """Mock storage get."""
+        return self.storage_data.get((namespace, key))
+    
+    async def delete(self, namespace: str, key: str):
+        """Mock storage delete."""
+        self.storage_data.pop((namespace, key), None)
+    
+    async def publish(self, event: str, data):
+        """Mock event publish."""
+        print(f"✓ Event published: {event}")
+    
+    async def call(self, service: str, **kwargs):
+        """Mock service call."""
+        pass
+
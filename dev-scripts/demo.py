@@ -5,16 +5,16 @@
 """
 
 import asyncio
-from pathlib import Path
 
 from core.config import Config
-from core.runtime import CoreRuntime
-from adapters.sqlite_adapter import SQLiteAdapter
+from core.utils.bootstrap import bootstrap_runtime
 from plugins.test import ExamplePlugin
 from modules import DevicesModule
 from plugins.test import SystemLoggerPlugin, AutomationStubPlugin
 # API module is loaded automatically via ModuleManager
 
+from _smoke_support import LOOP_FACTORY
+
 
 async def demo():
     """Демонстрация работы Core Runtime."""
@@ -25,32 +25,25 @@ async def demo():
     
     # 1. Создание Runtime
     print("\n[1] Создание Runtime...")
-    config = Config(db_path="data/demo.db")
-    Path(config.db_path).parent.mkdir(parents=True, exist_ok=True)
-    
-    adapter = SQLiteAdapter(config.db_path)
-    # Инициализация схемы для demo
-    await adapter.initialize_schema()
-    runtime = CoreRuntime(adapter)
+    runtime = await bootstrap_runtime(Config(db_path="data/demo.db"))
     print("✓ Runtime создан")
     
     # 2. Загрузка плагинов
     print("\n[2] Загрузка плагинов...")
     
-    # System logger — инфраструктурный плагин
+    # System logger — инфраструктурный плагин,
+    # automation stub — демонстрация event-driven архитектуры.
+    # Друг от друга не зависят — загружаем одним пакетом
     logger = SystemLoggerPlugin(runtime)
-    await runtime.plugin_manager.load_plugin(logger)
+    automation = AutomationStubPlugin(runtime)
+    await runtime.plugin_manager.load_plugins([logger, automation])
     print(f"✓ Плагин '{logger.metadata.name}' загружен")
+    print(f"✓ Плагин '{automation.metadata.name}' загружен")
     
     # Devices — доменный модуль
     devices_module = DevicesModule(runtime)
     await runtime.module_manager.register(devices_module)
     print("✓ devices module зарегистрирован")
-    
-    # Automation stub — демонстрация event-driven архитектуры
-    automation = AutomationStubPlugin(runtime)
-    await runtime.plugin_manager.load_plugin(automation)
-    print(f"✓ Плагин '{automation.metadata.name}' загружен")
 
     # Загружаем примерный плагин example, чтобы его сервисы были доступны
     try:
@@ -88,8 +81,7 @@ async def demo():
     await runtime.event_bus.publish("example.test", {
         "message": "Это тестовое событие",
         "timestamp": "2026-01-06"
-    })
-    await asyncio.sleep(0.1)  # Дать время на обработку
+    })  # publish() дожидается обработчиков — ждать не нужно
     
     # 6.1. ДЕМОНСТРАЦИЯ EVENT-DRIVEN АВТОМАТИЗАЦИИ
     print("\n[6.1] Демонстрация Event-Driven автоматизации...")
@@ -109,9 +101,6 @@ async def demo():
     await runtime.service_registry.call("devices.turn_on", "lamp_kitchen")
     print("       ✓ Устройство включено")
     
-    # Даём время на обработку события и логирование
-    await asyncio.sleep(0.2)
-    
     print("       ↓ Цепочка обработки:")
     print("       1. devices.turn_on → изменение состояния")
     print("       2. devices.state_changed → событие")
@@ -131,17 +120,26 @@ async def demo():
     
     # 8. Работа с Storage
     print("\n[8] Сохранение данных в Storage...")
-    await runtime.storage.set("demo", "device_1", {
-        "name": "Лампа в кухне",
-        "state": "on",
-        "brightness": 75
+    # Пачкой — одна запись в storage вместо set() на каждое устройство
+    await runtime.storage.batch_set("demo", {
+        "device_1": {
+            "name": "Лампа в кухне",
+            "state": "on",
+            "brightness": 75
+        },
+        "device_2": {
+            "name": "Лампа в спальне",
+            "state": "off",
+            "brightness": 0
+        },
     })
     
     keys = await runtime.storage.list_keys("demo")
     print(f"   Ключи в namespace 'demo': {keys}")
     
-    device = await runtime.storage.get("demo", "device_1")
-    print(f"   Устройство: {device}")
+    devices = await runtime.storage.batch_get("demo", keys)
+    for key, device in devices.items():
+        print(f"   Устройство {key}: {device}")
     
     # 9. Список плагинов
     print("\n[9] Список загруженных плагинов...")
@@ -167,4 +165,5 @@ async def demo():
 
 
 if __name__ == "__main__":
-    asyncio.run(demo())
+    with asyncio.Runner(loop_factory=LOOP_FACTORY) as runner:
+        runner.run(demo())
@@ -1,37 +1,114 @@
 #!/usr/bin/env python3
 import asyncio
+import json
+import os
 import pkgutil
 import importlib
-import inspect
 from pathlib import Path
 
-from core.config import Config
-from core.runtime import CoreRuntime
-from adapters.sqlite_adapter import SQLiteAdapter
 from core.base_plugin import BasePlugin
+from core.utils.bootstrap import bootstrap_runtime
+
+from _smoke_support import LOOP_FACTORY
+
+_ROOT = Path(__file__).resolve().parent.parent
+_CACHE_PATH = _ROOT / "data" / ".plugin_cache.json"
+
+
+def _dir_stamp(plugins_dir: Path) -> int:
+    """Latest mtime of plugins/ and its direct subdirectories.
+
+    Adding/removing a module changes plugins/ itself; adding __init__.py to a
+    subdirectory changes that subdirectory — both invalidate the cache.
+    """
+    stamp = plugins_dir.stat().st_mtime_ns
+    for entry in plugins_dir.iterdir():
+        if entry.is_dir():
+            stamp = max(stamp, entry.stat().st_mtime_ns)
+    return stamp
+
+
+def discover_plugin_modules(plugins_dir: Path) -> list[str]:
+    """Module names under plugins/, cached on disk until the directory changes."""
+    stamp = _dir_stamp(plugins_dir)
+    try:
+        cache = json.loads(_CACHE_PATH.read_text(encoding="utf-8"))
+        if cache.get("mtime") == stamp:
+            return cache["names"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    names = [name for _finder, name, _ispkg in pkgutil.iter_modules([str(plugins_dir)])]
+    try:
+        _CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _CACHE_PATH.write_text(json.dumps({"mtime": stamp, "names": names}), encoding="utf-8")
+    except OSError:
+        pass
+    return names
+
+
+# module name -> (source mtime, plugin classes); reused while the file is unchanged
+_PLUGIN_CLASS_CACHE: dict[str, tuple[float, list[type]]] = {}
+
+
+def plugin_classes(module) -> list[type]:
+    """BasePlugin subclasses defined in the module or its own submodules.
+
+    Classes imported from elsewhere (e.g. core) are skipped; the result is
+    cached per module until its source file changes.
+    """
+    path = getattr(module, "__file__", None)
+    mtime = os.path.getmtime(path) if path else 0.0
+    cached = _PLUGIN_CLASS_CACHE.get(module.__name__)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    prefix = module.__name__
+    classes = [
+        obj for obj in vars(module).values()
+        if isinstance(obj, type)
+        and obj is not BasePlugin
+        and issubclass(obj, BasePlugin)
+        and (obj.__module__ == prefix or obj.__module__.startswith(prefix + "."))
+    ]
+    _PLUGIN_CLASS_CACHE[module.__name__] = (mtime, classes)
+    return classes
+
 
 async def main():
-    config = Config.from_env()
-    Path(config.db_path).parent.mkdir(parents=True, exist_ok=True)
-    storage_adapter = SQLiteAdapter(config.db_path)
-    await storage_adapter.initialize_schema()
-    runtime = CoreRuntime(storage_adapter)
-
-    plugins_dir = Path(__file__).parent / ".." / "plugins"
-    for _finder, mod_name, _ispkg in pkgutil.iter_modules([str(plugins_dir)]):
+    runtime = await bootstrap_runtime()
+
+    plugins_dir = _ROOT / "plugins"
+    pending = []
+    for mod_name in await asyncio.to_thread(discover_plugin_modules, plugins_dir):
         module_name = f"plugins.{mod_name}"
         try:
             module = importlib.import_module(module_name)
-            for _name, obj in inspect.getmembers(module, inspect.isclass):
-                try:
-                    if issubclass(obj, BasePlugin) and obj is not BasePlugin:
-                        plugin_instance = obj(runtime)
-                        await runtime.plugin_manager.load_plugin(plugin_instance)
-                except Exception as e:
-                    print(f"skip class {obj} due to {e}")
-                    continue
         except Exception as e:
             print(f"skip module {module_name} due to {e}")
+            continue
+        for obj in plugin_classes(module):
+            try:
+                pending.append(obj(runtime))
+            except Exception as e:
+                print(f"skip class {obj} due to {e}")
+
+    # Load plugins concurrently in waves: a plugin is loaded once all of its
+    # declared dependencies are loaded (load_plugin checks them)
+    while pending:
+        loaded = set(runtime.plugin_manager.list_plugins())
+        wave = [p for p in pending if all(d in loaded for d in p.metadata.dependencies or ())]
+        if not wave:
+            # Unresolvable dependencies: let load_plugin report them
+            wave = pending
+        pending = [p for p in pending if p not in wave]
+        results = await asyncio.gather(
+            *(runtime.plugin_manager.load_plugin(p) for p in wave),
+            return_exceptions=True,
+        )
+        for plugin_instance, result in zip(wave, results):
+            if isinstance(result, Exception):
+                print(f"skip class {type(plugin_instance)} due to {result}")
 
     print("Loaded plugins:", runtime.plugin_manager.list_plugins())
     print("Registered HTTP endpoints:")
@@ -39,8 +116,11 @@ async def main():
         print(f"  {ep.method} {ep.path} -> {ep.service}")
 
     print("Registered services (sample):")
-    for name in ["oauth_yandex.get_status", "oauth_yandex.get_authorize_url", "oauth_yandex.exchange_code"]:
-        print(name, await runtime.service_registry.has_service(name))
+    names = ["oauth_yandex.get_status", "oauth_yandex.get_authorize_url", "oauth_yandex.exchange_code"]
+    present = await asyncio.gather(*(runtime.service_registry.has_service(n) for n in names))
+    for name, has in zip(names, present):
+        print(name, has)
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    with asyncio.Runner(loop_factory=LOOP_FACTORY) as runner:
+        runner.run(main())
@@ -16,17 +16,20 @@ Prerequisites:
 
 import asyncio
 import signal
+import sys
 from typing import Any
 
-from core.config import Config
-from core.runtime import CoreRuntime
-from adapters.sqlite_adapter import SQLiteAdapter
+from core.utils.bootstrap import bootstrap_runtime
+
+from _smoke_support import LOOP_FACTORY
+
+# How often queued device updates are written to stdout (seconds)
+UPDATE_FLUSH_INTERVAL = 0.05
 
 
 async def main() -> None:
-    # Use default DB path or override if needed
-    storage = SQLiteAdapter(Config.db_path())
-    runtime = CoreRuntime(storage)
+    # Storage and DB path come from environment (see Config.from_env)
+    runtime = await bootstrap_runtime()
 
     # Graceful shutdown on Ctrl+C
     loop = asyncio.get_running_loop()
@@ -68,16 +71,33 @@ async def main() -> None:
 
     print("[info] Cookies OK. Waiting for Quasar WS to connect...")
 
-    # Subscribe to device state updates
+    # Subscribe to device state updates.
+    # Updates are queued and printed in batches so bursts of WS events
+    # don't stall event bus dispatch behind a stdout write per update.
     updates_count = 0
+    updates: asyncio.Queue = asyncio.Queue()
 
-    async def on_update(event_type: str, payload: Any):
+    # Plain (sync) handler: the event bus calls it inline, no Task per event
+    def on_update(event_type: str, payload: Any) -> None:
         nonlocal updates_count
         updates_count += 1
-        device_id = payload.get("external_id")
-        state = payload.get("state")
-        print(f"[update] {device_id}: {state}")
-
+        updates.put_nowait((payload.get("external_id"), payload.get("state")))
+
+    def flush_updates() -> None:
+        lines = []
+        while not updates.empty():
+            device_id, state = updates.get_nowait()
+            lines.append(f"[update] {device_id}: {state}\n")
+        if lines:
+            sys.stdout.write("".join(lines))
+            sys.stdout.flush()
+
+    async def drain_updates() -> None:
+        while True:
+            await asyncio.sleep(UPDATE_FLUSH_INTERVAL)
+            flush_updates()
+
+    drainer = asyncio.create_task(drain_updates())
     await runtime.event_bus.subscribe("external.device_state_reported", on_update)
 
     # Optionally trigger device sync to seed states if service exists
@@ -99,9 +119,12 @@ async def main() -> None:
     try:
         await stop_event.wait()
     finally:
+        drainer.cancel()
+        flush_updates()
         print(f"[summary] Received {updates_count} updates")
         await runtime.shutdown()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    with asyncio.Runner(loop_factory=LOOP_FACTORY) as runner:
+        runner.run(main())
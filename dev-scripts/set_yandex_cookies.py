@@ -18,63 +18,88 @@ Quasar API требует cookies из активной сессии Яндек
 Использование:
     python dev-scripts/set_yandex_cookies.py
     
+Или JSON-объектом через stdin:
+    echo '{"Session_id": "...", "yandexuid": "..."}' | python dev-scripts/set_yandex_cookies.py
+    
 Или напрямую через API:
     curl -X POST http://localhost:8000/oauth/yandex/cookies \
       -H "Content-Type: application/json" \
       -d '{"Session_id": "...", "yandexuid": "...", "sessionid2": "..."}'
 """
 import asyncio
+import json
 import sys
 from pathlib import Path
 
 # Добавляем путь к core-runtime в sys.path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.runtime import CoreRuntime
+from core.utils.bootstrap import bootstrap_runtime
+
+from _smoke_support import LOOP_FACTORY
+
+
+# Обязательные cookies для Quasar API
+REQUIRED_COOKIES = ("Session_id", "yandexuid")
+
 
+def read_cookies() -> dict | None:
+    """
+    Прочитать cookies до запуска event loop (input() блокирует поток).
 
-async def main():
+    Если stdin не терминал — ожидается JSON-объект cookies целиком
+    (например, `pbpaste | python dev-scripts/set_yandex_cookies.py`).
+    В интерактивном режиме можно вставить JSON одной строкой
+    или ввести cookies по одной.
+    """
     print("=== Установка Yandex Session Cookies для Quasar API ===\n")
     print("Quasar API (iot.quasar.yandex.ru) требует cookies из активной сессии Яндекса.")
     print("OAuth токен НЕ работает для Quasar API.\n")
-    
-    print("Введите cookies из вашей активной сессии яндекса:")
-    print("(Откройте DevTools в браузере → Application → Cookies → https://yandex.ru)\n")
-    
-    cookies = {}
-    
-    # Основные cookies
-    session_id = input("Session_id (обязательно): ").strip()
-    if not session_id:
-        print("❌ Session_id обязателен!")
-        return
-    cookies["Session_id"] = session_id
-    
-    yandexuid = input("yandexuid (обязательно): ").strip()
-    if not yandexuid:
-        print("❌ yandexuid обязателен!")
-        return
-    cookies["yandexuid"] = yandexuid
-    
-    # Дополнительные cookies
-    sessionid2 = input("sessionid2 (опционально, Enter чтобы пропустить): ").strip()
-    if sessionid2:
-        cookies["sessionid2"] = sessionid2
-    
-    i_cookie = input("i (опционально, Enter чтобы пропустить): ").strip()
-    if i_cookie:
-        cookies["i"] = i_cookie
-    
-    l_cookie = input("L (опционально, Enter чтобы пропустить): ").strip()
-    if l_cookie:
-        cookies["L"] = l_cookie
-    
+
+    if not sys.stdin.isatty():
+        raw = sys.stdin.read()
+    else:
+        print("Введите cookies из вашей активной сессии яндекса:")
+        print("(Откройте DevTools в браузере → Application → Cookies → https://yandex.ru)\n")
+        raw = input("JSON с cookies или Session_id (обязательно): ").strip()
+
+    if raw.lstrip().startswith("{"):
+        try:
+            parsed = json.loads(raw)
+        except json.JSONDecodeError as e:
+            print(f"❌ Невалидный JSON: {e}")
+            return None
+        cookies = {k: str(v).strip() for k, v in parsed.items() if str(v).strip()}
+    elif not sys.stdin.isatty():
+        print("❌ Ожидается JSON-объект с cookies в stdin")
+        return None
+    else:
+        cookies = {"Session_id": raw.strip()}
+        for name, prompt in (
+            ("yandexuid", "yandexuid (обязательно): "),
+            ("sessionid2", "sessionid2 (опционально, Enter чтобы пропустить): "),
+            ("i", "i (опционально, Enter чтобы пропустить): "),
+            ("L", "L (опционально, Enter чтобы пропустить): "),
+        ):
+            value = input(prompt).strip()
+            if value:
+                cookies[name] = value
+
+    # Валидируем до создания runtime
+    for name in REQUIRED_COOKIES:
+        if not cookies.get(name):
+            print(f"❌ {name} обязателен!")
+            return None
+    return cookies
+
+
+async def main(cookies: dict) -> None:
     print("\n📝 Сохраняю cookies...")
     
     # Создаём runtime и сохраняем cookies
-    runtime = CoreRuntime()
+    runtime = await bootstrap_runtime()
     try:
-        await runtime.initialize()
+        await runtime.start()
         
         # Сохраняем через service
         await runtime.service_registry.call("oauth_yandex.set_cookies", cookies=cookies)
@@ -91,4 +116,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    cookies = read_cookies()
+    if cookies:
+        with asyncio.Runner(loop_factory=LOOP_FACTORY) as runner:
+            runner.run(main(cookies))
@@ -2,293 +2,232 @@
 Smoke runner: запуск CoreRuntime, загрузка yandex_smart_home_real и вызов yandex.sync_devices
 
 Этот тест:
-1. Создаёт RuntimeyWithMockOAuth
-2. Регистрирует mock oauth_yandex.get_tokens (возвращает fake access_token)
-3. Mock-ит aiohttp для вернёния fake Яндекс API response
+1. Создаёт Runtime и включает флаг yandex.use_real_api
+2. Регистрирует mock oauth_yandex.get_access_token (возвращает fake access_token);
+   cookies не задаются: Quasar API недоступен, sync идёт через fallback на OAuth API
+3. Mock-ит aiohttp для возврата fake Яндекс API response
 4. Загружает real plugin
 5. Вызывает yandex.sync_devices и проверяет результаты
 
 Файл временный — легко удаляется.
 """
 import asyncio
-from typing import Any, Dict, Optional
-from unittest.mock import AsyncMock, MagicMock, patch
+import json
+from operator import itemgetter
+from pathlib import Path
+from typing import Optional
+from unittest.mock import patch
 
 from core.runtime import CoreRuntime
 from plugins.yandex_smart_home import YandexSmartHomeRealPlugin
 from modules import DevicesModule
 from plugins.test import SystemLoggerPlugin
 
+from _smoke_support import (
+    LOOP_FACTORY,
+    MockAsyncContextManager,
+    SimpleMemoryStorage,
+    buffered_output,
+)
 
-class SimpleMemoryStorage:
-    def __init__(self):
-        self._data: Dict[str, Dict[str, Dict[str, Any]]] = {}
 
-    async def get(self, namespace: str, key: str) -> Optional[dict]:
-        return self._data.get(namespace, {}).get(key)
+# Mock Яндекс API response
+_FIXTURE_PATH = Path(__file__).parent / "fixtures" / "yandex_devices.json"
+_cached_response: Optional[dict] = None
 
-    async def set(self, namespace: str, key: str, value: dict) -> None:
-        self._data.setdefault(namespace, {})[key] = value
+# Обязательные поля устройства (формат stub-плагина)
+_REQUIRED_DEVICE_FIELDS = itemgetter("provider", "external_id", "type", "capabilities", "state")
 
-    async def delete(self, namespace: str, key: str) -> bool:
-        ns = self._data.get(namespace, {})
-        if key in ns:
-            del ns[key]
-            return True
-        return False
 
-    async def list_keys(self, namespace: str) -> list:
-        return list(self._data.get(namespace, {}).keys())
+def _freeze_lists(value):
+    """Списки → кортежи (рекурсивно); словари остаются dict — плагин проверяет isinstance(dict)."""
+    if isinstance(value, list):
+        return tuple(_freeze_lists(item) for item in value)
+    if isinstance(value, dict):
+        return {k: _freeze_lists(v) for k, v in value.items()}
+    return value
 
-    async def clear_namespace(self, namespace: str) -> None:
-        self._data.pop(namespace, None)
 
-    async def close(self) -> None:
-        pass
+def yandex_mock_response() -> dict:
+    """Mock-ответ Яндекс API; читается из fixtures/ при первом обращении.
 
+    Ответ только читается, поэтому вложенные списки заморожены в кортежи
+    и один и тот же объект переиспользуется во всех вызовах.
+    """
+    global _cached_response
+    if _cached_response is None:
+        _cached_response = _freeze_lists(
+            json.loads(_FIXTURE_PATH.read_text(encoding="utf-8"))
+        )
+    return _cached_response
+
+
+class _FakeResponse:
+    """Ответ aiohttp: простые async методы вместо AsyncMock на каждый запрос."""
+    __slots__ = ()
+
+    status = 200
+
+    async def json(self):
+        return yandex_mock_response()
+
+    async def text(self):
+        return "OK"
+
+
+# Fake-объекты без состояния: создаются один раз и переиспользуются каждым get()
+_RESPONSE_CTX = MockAsyncContextManager(_FakeResponse())
+
+
+class _FakeSession:
+    """Mock для aiohttp.ClientSession (используется как async context manager)."""
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        pass
 
-# Mock Яндекс API response
-YANDEX_MOCK_RESPONSE = {
-    "devices": [
-        {
-            "id": "yandex-light-kitchen",
-            "name": "Свет кухни",
-            "type": "devices.types.light",
-            "capabilities": [
-                {
-                    "type": "devices.capabilities.on_off",
-                    "retrievable": True,
-                    "reportable": True,
-                },
-                {
-                    "type": "devices.capabilities.range",
-                    "retrievable": True,
-                    "reportable": True,
-                    "parameters": {
-                        "instance": "brightness",
-                        "range": {"min": 0, "max": 100}
-                    }
-                }
-            ],
-            "states": [
-                {
-                    "type": "devices.capabilities.on_off",
-                    "state": {
-                        "instance": "on",
-                        "value": True
-                    }
-                },
-                {
-                    "type": "devices.capabilities.range",
-                    "state": {
-                        "instance": "brightness",
-                        "value": 75
-                    }
-                }
-            ]
-        },
-        {
-            "id": "yandex-light-bedroom",
-            "name": "Свет спальни",
-            "type": "devices.types.light",
-            "capabilities": [
-                {
-                    "type": "devices.capabilities.on_off",
-                    "retrievable": True,
-                    "reportable": True,
-                }
-            ],
-            "states": [
-                {
-                    "type": "devices.capabilities.on_off",
-                    "state": {
-                        "instance": "on",
-                        "value": False
-                    }
-                }
-            ]
-        },
-        {
-            "id": "yandex-sensor-temp",
-            "name": "Датчик температуры",
-            "type": "devices.types.sensor.climate",
-            "capabilities": [
-                {
-                    "type": "devices.capabilities.range",
-                    "retrievable": True,
-                    "reportable": True,
-                    "parameters": {
-                        "instance": "temperature",
-                        "unit": "unit.temperature.celsius",
-                        "range": {"min": -50, "max": 50}
-                    }
-                }
-            ],
-            "states": [
-                {
-                    "type": "devices.capabilities.range",
-                    "state": {
-                        "instance": "temperature",
-                        "value": 22.5
-                    }
-                }
-            ]
-        }
-    ]
-}
-
-
-class MockAsyncContextManager:
-    """Mock для aiohttp.ClientSession.get() context manager."""
-    def __init__(self, response):
-        self.response = response
-    
     async def __aenter__(self):
-        return self.response
-    
+        return self
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         pass
 
+    async def get(self, url, headers=None, timeout=None, **kwargs):
+        """Mock для aiohttp.ClientSession.get() (клиент вызывает `async with await session.get()`)."""
+        return _RESPONSE_CTX
 
-def mock_aiohttp_get(url, headers, timeout):
-    """Mock для aiohttp.ClientSession.get()."""
-    mock_resp = MagicMock()
-    mock_resp.status = 200
-    mock_resp.json = AsyncMock(return_value=YANDEX_MOCK_RESPONSE)
-    mock_resp.text = AsyncMock(return_value="OK")
-    
-    return MockAsyncContextManager(mock_resp)
+    async def close(self):
+        pass
 
 
 async def main():
     print("=== Smoke Test: yandex_smart_home_real ===\n")
 
     storage = SimpleMemoryStorage()
+    # Feature flag: без него yandex.sync_devices падает с use_real_api_disabled
+    await storage.set("yandex", "use_real_api", {"enabled": True})
     runtime = CoreRuntime(storage)
 
-    # Счётчик событий
+    # Счётчик событий; all_discovered — барьер вместо sleep
     events_received = []
+    expected_events = len(yandex_mock_response()["devices"])
+    all_discovered = asyncio.Event()
 
-    async def _on_device_discovered(event_type: str, data: dict):
+    # Обработчики синхронные: ничего не ждут, EventBus вызывает их inline
+    def _on_device_discovered(event_type: str, data: dict):
         print(f"[EVENT] {event_type}")
         print(f"  provider: {data.get('provider')}")
         print(f"  external_id: {data.get('external_id')}")
         print(f"  type: {data.get('type')}")
         print(f"  capabilities: {data.get('capabilities')}")
         print(f"  state: {data.get('state')}\n")
-        events_received.append(data)
 
-    await runtime.event_bus.subscribe("external.device_discovered", _on_device_discovered)
+    # Пакетная форма: считаем устройства по external.devices_discovered
+    def _on_devices_discovered(event_type: str, data: dict):
+        print(f"[EVENT] {event_type}: {len(data['devices'])} devices\n")
+        events_received.extend(data["devices"])
+        if len(events_received) >= expected_events:
+            all_discovered.set()
 
-    # Загрузить logger
-    logger_plugin = SystemLoggerPlugin(runtime)
-    print("Loading system_logger plugin...")
-    await runtime.plugin_manager.load_plugin(logger_plugin)
-    await runtime.plugin_manager.start_plugin(logger_plugin.metadata.name)
-
-    # Register devices module instead of loading plugin
-    print("Registering devices module...")
-    devices_module = DevicesModule(runtime)
-    await runtime.module_manager.register(devices_module)
+    await runtime.event_bus.subscribe("external.device_discovered", _on_device_discovered)
+    await runtime.event_bus.subscribe("external.devices_discovered", _on_devices_discovered)
 
-    # Регистрируем mock oauth_yandex.get_tokens
-    async def mock_get_tokens():
-        print("[MOCK] oauth_yandex.get_tokens called, returning fake access_token")
-        return {
-            "access_token": "fake_access_token_12345",
-            "token_type": "Bearer",
-            "expires_in": 3600,
-        }
+    # Регистрируем mock oauth_yandex.get_access_token (его вызывает YandexAPIClient)
+    async def mock_get_access_token():
+        print("[MOCK] oauth_yandex.get_access_token called, returning fake access_token")
+        return "fake_access_token_12345"
 
-    await runtime.service_registry.register("oauth_yandex.get_tokens", mock_get_tokens)
+    await runtime.service_registry.register("oauth_yandex.get_access_token", mock_get_access_token)
 
-    # Загрузить real plugin
+    # Загрузка logger, devices module и real plugin не зависит друг от друга —
+    # выполняем параллельно; старт плагинов — последовательно
+    logger_plugin = SystemLoggerPlugin(runtime)
+    devices_module = DevicesModule(runtime)
     real_plugin = YandexSmartHomeRealPlugin(runtime)
-    print("Loading yandex_smart_home_real plugin...")
-    await runtime.plugin_manager.load_plugin(real_plugin)
+    print("Loading system_logger, devices module and yandex_smart_home_real...")
+    await asyncio.gather(
+        runtime.plugin_manager.load_plugins([logger_plugin, real_plugin]),
+        runtime.module_manager.register(devices_module),
+    )
+
+    # metadata — свойство, строящее объект на каждое обращение; имя читаем один раз
+    # (после load: on_load() может обновить metadata)
+    logger_name = logger_plugin.metadata.name
+    real_name = real_plugin.metadata.name
+
+    await runtime.plugin_manager.start_plugin(logger_name)
     print("Starting yandex_smart_home_real plugin...")
-    await runtime.plugin_manager.start_plugin(real_plugin.metadata.name)
+    await runtime.plugin_manager.start_plugin(real_name)
 
     # Вызов сервиса sync_devices с mock aiohttp
     print("\nCalling yandex.sync_devices with mocked aiohttp...\n")
     
     # Patch aiohttp.ClientSession
-    with patch("aiohttp.ClientSession") as mock_session_class:
-        mock_session = MagicMock()
-        mock_session_class.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session_class.return_value.__aexit__ = AsyncMock(return_value=None)
-        mock_session.get = mock_aiohttp_get
+    with patch("aiohttp.ClientSession", _FakeSession):
+        devices = await runtime.service_registry.call("yandex.sync_devices")
+        # publish() ждёт обработчики, но барьер страхует от отложенной доставки
+        await asyncio.wait_for(all_discovered.wait(), timeout=2.0)
+        print(f"\n✓ sync_devices returned {len(devices)} devices")
+        print(f"✓ {len(events_received)} events received\n")
         
-        try:
-            devices = await runtime.service_registry.call("yandex.sync_devices")
-            print(f"\n✓ sync_devices returned {len(devices)} devices")
-            print(f"✓ {len(events_received)} events received\n")
-            
-            # Проверка совместимости со stub-плагином
-            print("=== Compatibility Check ===\n")
-            for device in devices:
-                assert device.get("provider") == "yandex", f"provider должен быть 'yandex', получено: {device.get('provider')}"
-                assert "external_id" in device, "external_id обязателен"
-                assert "type" in device, "type обязателен"
-                assert "capabilities" in device, "capabilities обязателены"
-                assert "state" in device, "state обязателен"
-            
-            print("✓ All devices have required fields")
-            print("✓ Format is identical to stub-plugin\n")
-            
-            # Проверка трансформации типов и capabilities
-            print("=== Device Transformation Check ===\n")
-            for device in devices:
-                external_id = device.get("external_id")
-                device_type = device.get("type")
-                capabilities = device.get("capabilities")
-                state = device.get("state")
-                
-                print(f"Device: {external_id}")
-                print(f"  Type: {device_type}")
-                print(f"  Capabilities: {capabilities}")
-                print(f"  State: {state}\n")
-            
-            assert len(devices) == 3, f"Expected 3 devices, got {len(devices)}"
-            
-            # Проверка первого устройства (свет с brightness)
-            light_kitchen = devices[0]
-            assert light_kitchen["external_id"] == "yandex-light-kitchen"
-            assert light_kitchen["type"] == "light"
-            assert "on_off" in light_kitchen["capabilities"]
-            assert "range" in light_kitchen["capabilities"]
-            assert light_kitchen["state"]["on"] == True
-            assert light_kitchen["state"]["range"] == 75
-            
-            # Проверка второго устройства (свет без brightness)
-            light_bedroom = devices[1]
-            assert light_bedroom["external_id"] == "yandex-light-bedroom"
-            assert light_bedroom["type"] == "light"
-            assert light_bedroom["state"]["on"] == False
-            
-            # Проверка датчика
-            sensor_temp = devices[2]
-            assert sensor_temp["external_id"] == "yandex-sensor-temp"
-            assert sensor_temp["type"] == "climate"  # devices.types.sensor.climate -> climate
-            assert "range" in sensor_temp["capabilities"]
-            assert sensor_temp["state"]["range"] == 22.5
+        # Проверка совместимости со stub-плагином
+        print("=== Compatibility Check ===\n")
+        # Один проход по устройству: KeyError, если обязательного поля нет
+        for device in devices:
+            provider, *_ = _REQUIRED_DEVICE_FIELDS(device)
+            assert provider == "yandex", f"provider должен быть 'yandex', получено: {provider}"
+        
+        print("✓ All devices have required fields")
+        print("✓ Format is identical to stub-plugin\n")
+        
+        # Проверка трансформации типов и capabilities
+        print("=== Device Transformation Check ===\n")
+        for device in devices:
+            external_id = device.get("external_id")
+            device_type = device.get("type")
+            capabilities = device.get("capabilities")
+            state = device.get("state")
             
-            print("✓ All assertions passed!\n")
-
-        except Exception as e:
-            print(f"\n✗ Error: {e}")
-            import traceback
-            traceback.print_exc()
+            print(f"Device: {external_id}")
+            print(f"  Type: {device_type}")
+            print(f"  Capabilities: {capabilities}")
+            print(f"  State: {state}\n")
+        
+        assert len(devices) == 3, f"Expected 3 devices, got {len(devices)}"
+        
+        # Проверка первого устройства (свет с brightness)
+        light_kitchen = devices[0]
+        assert light_kitchen["external_id"] == "yandex-light-kitchen"
+        assert light_kitchen["type"] == "light"
+        assert "on_off" in light_kitchen["capabilities"]
+        assert "range" in light_kitchen["capabilities"]
+        assert light_kitchen["state"]["on"] == True
+        assert light_kitchen["state"]["range"] == 75
+        
+        # Проверка второго устройства (свет без brightness)
+        light_bedroom = devices[1]
+        assert light_bedroom["external_id"] == "yandex-light-bedroom"
+        assert light_bedroom["type"] == "light"
+        assert light_bedroom["state"]["on"] == False
+        
+        # Проверка датчика
+        sensor_temp = devices[2]
+        assert sensor_temp["external_id"] == "yandex-sensor-temp"
+        assert sensor_temp["type"] == "climate"  # devices.types.sensor.climate -> climate
+        assert "range" in sensor_temp["capabilities"]
+        assert sensor_temp["state"]["range"] == 22.5
+        
+        print("✓ All assertions passed!\n")
 
     # Остановить и выгрузить
     print("Stopping plugins...")
-    await runtime.plugin_manager.stop_plugin(real_plugin.metadata.name)
-    await runtime.plugin_manager.unload_plugin(real_plugin.metadata.name)
+    await runtime.plugin_manager.stop_plugin(real_name)
+    await runtime.plugin_manager.unload_plugin(real_name)
 
     # devices module is built-in; no plugin stop/unload required
 
-    await runtime.plugin_manager.stop_plugin(logger_plugin.metadata.name)
-    await runtime.plugin_manager.unload_plugin(logger_plugin.metadata.name)
+    await runtime.plugin_manager.stop_plugin(logger_name)
+    await runtime.plugin_manager.unload_plugin(logger_name)
 
     await runtime.storage.close()
 
@@ -296,4 +235,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    with buffered_output(), asyncio.Runner(debug=False, loop_factory=LOOP_FACTORY) as runner:
+        runner.run(main())
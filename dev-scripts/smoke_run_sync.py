@@ -5,7 +5,6 @@
 """
 import asyncio
 import sys
-from typing import Any, Dict, Optional
 
 # Настроить sys.path чтобы корректно импортировать package
 ROOT = __file__
@@ -13,40 +12,15 @@ ROOT = __file__
 from core.runtime import CoreRuntime
 from plugins.test import YandexSmartHomeStubPlugin
 
-
-class SimpleMemoryStorage:
-    def __init__(self):
-        self._data: Dict[str, Dict[str, Dict[str, Any]]] = {}
-
-    async def get(self, namespace: str, key: str) -> Optional[dict]:
-        return self._data.get(namespace, {}).get(key)
-
-    async def set(self, namespace: str, key: str, value: dict) -> None:
-        self._data.setdefault(namespace, {})[key] = value
-
-    async def delete(self, namespace: str, key: str) -> bool:
-        ns = self._data.get(namespace, {})
-        if key in ns:
-            del ns[key]
-            return True
-        return False
-
-    async def list_keys(self, namespace: str) -> list:
-        return list(self._data.get(namespace, {}).keys())
-
-    async def clear_namespace(self, namespace: str) -> None:
-        self._data.pop(namespace, None)
-
-    async def close(self) -> None:
-        pass
+from _smoke_support import SimpleMemoryStorage, buffered_output, LOOP_FACTORY
 
 
 async def main():
     storage = SimpleMemoryStorage()
     runtime = CoreRuntime(storage)
 
-    # Подписчик для показа событий в консоли
-    async def _print_event(event_type: str, data: dict):
+    # Подписчик для показа событий в консоли (синхронный: EventBus вызывает его inline)
+    def _print_event(event_type: str, data: dict):
         print(f"[EVENT] {event_type}: {data}")
 
     await runtime.event_bus.subscribe("external.device_discovered", _print_event)
@@ -55,8 +29,9 @@ async def main():
     plugin = YandexSmartHomeStubPlugin(runtime)
     print("Loading plugin...")
     await runtime.plugin_manager.load_plugin(plugin)
+    plugin_name = plugin.metadata.name
     print("Starting plugin...")
-    await runtime.plugin_manager.start_plugin(plugin.metadata.name)
+    await runtime.plugin_manager.start_plugin(plugin_name)
 
     # Вызов сервиса sync_devices
     print("Calling yandex.sync_devices service...")
@@ -64,18 +39,19 @@ async def main():
     print("Returned devices:")
     print(devices)
 
-    # Дать немного времени на обработку событий
-    await asyncio.sleep(0.5)
+    # Ждать не нужно: event_bus.publish() дожидается обработчиков,
+    # поэтому события уже обработаны к возврату sync_devices
 
     # Остановить и выгрузить плагин
     print("Stopping plugin...")
-    await runtime.plugin_manager.stop_plugin(plugin.metadata.name)
+    await runtime.plugin_manager.stop_plugin(plugin_name)
     print("Unloading plugin...")
-    await runtime.plugin_manager.unload_plugin(plugin.metadata.name)
+    await runtime.plugin_manager.unload_plugin(plugin_name)
 
     # Закрыть storage
     await runtime.storage.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    with buffered_output(), asyncio.Runner(debug=False, loop_factory=LOOP_FACTORY) as runner:
+        runner.run(main())
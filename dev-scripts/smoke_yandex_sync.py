@@ -4,46 +4,20 @@
 Файл временный — легко удаляется.
 """
 import asyncio
-from typing import Any, Dict, Optional
 
 from core.runtime import CoreRuntime
 from plugins.test import YandexSmartHomeStubPlugin
 from modules.devices import register_devices
 
-
-class SimpleMemoryStorage:
-    def __init__(self):
-        self._data: Dict[str, Dict[str, Dict[str, Any]]] = {}
-
-    async def get(self, namespace: str, key: str) -> Optional[dict]:
-        return self._data.get(namespace, {}).get(key)
-
-    async def set(self, namespace: str, key: str, value: dict) -> None:
-        self._data.setdefault(namespace, {})[key] = value
-
-    async def delete(self, namespace: str, key: str) -> bool:
-        ns = self._data.get(namespace, {})
-        if key in ns:
-            del ns[key]
-            return True
-        return False
-
-    async def list_keys(self, namespace: str) -> list:
-        return list(self._data.get(namespace, {}).keys())
-
-    async def clear_namespace(self, namespace: str) -> None:
-        self._data.pop(namespace, None)
-
-    async def close(self) -> None:
-        pass
+from _smoke_support import SimpleMemoryStorage, buffered_output, LOOP_FACTORY
 
 
 async def main():
     storage = SimpleMemoryStorage()
     runtime = CoreRuntime(storage)
 
-    # Подписчик для показа событий в консоли
-    async def _print_event(event_type: str, data: dict):
+    # Подписчик для показа событий в консоли (синхронный: EventBus вызывает его inline)
+    def _print_event(event_type: str, data: dict):
         print(f"[EVENT] {event_type}: {data}")
 
     await runtime.event_bus.subscribe("external.device_discovered", _print_event)
@@ -55,8 +29,9 @@ async def main():
     plugin = YandexSmartHomeStubPlugin(runtime)
     print("Loading yandex plugin...")
     await runtime.plugin_manager.load_plugin(plugin)
+    plugin_name = plugin.metadata.name
     print("Starting yandex plugin...")
-    await runtime.plugin_manager.start_plugin(plugin.metadata.name)
+    await runtime.plugin_manager.start_plugin(plugin_name)
 
     # Вызов сервиса sync_devices
     print("Calling yandex.sync_devices service...")
@@ -78,14 +53,14 @@ async def main():
             stored = await runtime.state_engine.get(f"devices.mapping.{external_id}")
             print(f"Mapping stored in state_engine: devices.mapping.{external_id} = {stored}")
 
-    # Дать немного времени на обработку событий
-    await asyncio.sleep(0.5)
+    # Ждать не нужно: event_bus.publish() дожидается обработчиков,
+    # поэтому события уже обработаны к возврату сервисов
 
     # Остановить и выгрузить плагины (в обратном порядке)
     print("Stopping yandex plugin...")
-    await runtime.plugin_manager.stop_plugin(plugin.metadata.name)
+    await runtime.plugin_manager.stop_plugin(plugin_name)
     print("Unloading yandex plugin...")
-    await runtime.plugin_manager.unload_plugin(plugin.metadata.name)
+    await runtime.plugin_manager.unload_plugin(plugin_name)
 
     # devices module is built-in; no plugin stop/unload required
 
@@ -94,4 +69,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    with buffered_output(), asyncio.Runner(debug=False, loop_factory=LOOP_FACTORY) as runner:
+        runner.run(main())
@@ -5,12 +5,8 @@ Smoke-test для интерактивного CLI.
 и проверяет, что состояние `presence.home` изменилось.
 """
 
-import asyncio
 import pytest
 
-from core.config import Config
-from core.runtime import CoreRuntime
-from adapters.sqlite_adapter import SQLiteAdapter
 from core import console
 
 
@@ -28,20 +24,20 @@ class InputSimulator:
         return ans
 
 
-@pytest.mark.asyncio
-async def test_cli_interactive():
-    # Подготовка: указываем тестовую БД
-    Config._overrides = {"db_path": "data/test_cli.db"}
-
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cli_interactive(clean_runtime):
     # Список ответов для интерактивного сеанса:
     # 1) выбираем по пути '/presence/enter'
     # 2) подтверждаем 'y'
     simulator = InputSimulator(["/presence/enter", "y"])
 
-    runtime = await console.run_cli(argv=None, input_func=simulator, shutdown_on_exit=False)
+    # Общий runtime из conftest: схема и плагины уже подготовлены
+    runtime = await console.run_cli(
+        argv=None, input_func=simulator, shutdown_on_exit=False, runtime=clean_runtime
+    )
 
-    # Даём время на обработку и синхронизацию
-    await asyncio.sleep(0.2)
+    # run_cli() дожидается вызова сервиса, а event_bus.publish() — обработчиков:
+    # к этому моменту состояние уже синхронизировано
 
     # После вызова ожидаем, что состояние установлено в True
     # Проверяем сначала в storage, потом в state_engine
@@ -61,9 +57,6 @@ async def test_cli_interactive():
     cur_val = cur.get("value") if isinstance(cur, dict) else cur
     assert cur_val is True
 
-    # Очистка
-    await runtime.shutdown()
-
 
 if __name__ == '__main__':
-    asyncio.run(test_cli_interactive())
+    pytest.main([__file__])
@@ -12,40 +12,7 @@ import aiohttp
 from plugins.yandex_device_auth.device_auth_service import YandexDeviceAuthService
 from plugins.yandex_device_auth.yandex_passport_client import DeviceAuthSession
 
-
-class MockRuntime:
-    """Mock runtime for testing."""
-    
-    def __init__(self):
-        self.storage_data = {}
-        self.storage = self
-        self.event_bus = self
-        self.service_registry = self
-    
-    async def set(self, namespace: str, key: str, value):
-        """Mock storage set."""
-        full_key = f"{namespace}/{key}"
-        self.storage_data[full_key] = value
-        print(f"✓ Storage SET: {full_key}")
-    
-    async def get(self, namespace: str, key: str):
-        """Mock storage get."""
-        full_key = f"{namespace}/{key}"
-        return self.storage_data.get(full_key)
-    
-    async def delete(self, namespace: str, key: str):
-        """Mock storage delete."""
-        full_key = f"{namespace}/{key}"
-        if full_key in self.storage_data:
-            del self.storage_data[full_key]
-    
-    async def publish(self, event: str, data):
-        """Mock event publish."""
-        print(f"✓ Event published: {event}")
-    
-    async def call(self, service: str, **kwargs):
-        """Mock service call."""
-        pass
+from _smoke_support import MockRuntime, LOOP_FACTORY
 
 
 async def main():
@@ -100,4 +67,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    with asyncio.Runner(debug=False, loop_factory=LOOP_FACTORY) as runner:
+        runner.run(main())
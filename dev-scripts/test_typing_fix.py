@@ -1,44 +1,28 @@
 #!/usr/bin/env python3
 """Quick test to verify runtime typing and plugin loading."""
 
-import asyncio
 import pytest
-from pathlib import Path
-from core.config import Config
 from core.runtime import CoreRuntime
-from adapters.sqlite_adapter import SQLiteAdapter
-from plugins.test import SystemLoggerPlugin
-
-
-@pytest.mark.asyncio
-async def test():
-    config = Config(db_path=':memory:')
-    adapter = SQLiteAdapter(':memory:')
-    await adapter.initialize_schema()
-    
-    runtime = CoreRuntime(adapter)
-    logger = SystemLoggerPlugin(runtime)
-    
-    # Загружаем плагины
-    await runtime.plugin_manager.load_plugin(logger)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_runtime_typing(clean_runtime):
+    runtime = clean_runtime
+
+    # system_logger загружен фикстурой runtime (conftest.py)
+    logger = runtime.plugin_manager.get_plugin("system_logger")
+    assert isinstance(logger.runtime, CoreRuntime)
     print('✓ Logger plugin loaded successfully')
     print(f'  logger.runtime type: {type(logger.runtime).__name__}')
-    
+
     # AutomationModule регистрируется автоматически при runtime.start()
-    await runtime.start()
     print('✓ Runtime started')
     print('✓ AutomationModule registered automatically')
-    
-    # Пытаемся использовать runtime через плагины
-    try:
-        await runtime.service_registry.call('logger.log', level='info', message='Test message')
-        print('✓ Logger service call successful')
-    except Exception as e:
-        print(f'✗ Logger service call failed: {e}')
-    
-    await runtime.shutdown()
-    print('✓ Runtime shutdown')
+
+    # Используем runtime через плагины; ошибка вызова роняет тест
+    await runtime.service_registry.call('logger.log', level='info', message='Test message')
+    print('✓ Logger service call successful')
 
 
 if __name__ == '__main__':
-    asyncio.run(test())
+    pytest.main([__file__])
@@ -11,57 +11,27 @@ Logger (output)
 Цель — доказать, что архитектура работает целиком.
 """
 
-import asyncio
+import sys
+
 import pytest
-from pathlib import Path
 
-from core.config import Config
-from core.runtime import CoreRuntime
-from adapters.sqlite_adapter import SQLiteAdapter
-from plugins.test import SystemLoggerPlugin, AutomationStubPlugin
-from modules import DevicesModule
+
+# Типы событий, используемые тестом (интернированы один раз на модуль)
+EVT_CMD = sys.intern("internal.device_command_requested")
 
 
-@pytest.mark.asyncio
-async def test_event_driven_automation():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_event_driven_automation(clean_runtime):
     """Smoke-тест архитектуры event-driven автоматизации."""
 
     print("\n" + "=" * 70)
     print("SMOKE-TEST: Event-Driven Архитектура")
     print("=" * 70)
 
-    # 1. Создание Runtime
-    print("\n[1] Инициализация Runtime...")
-    config = Config(db_path="data/test_automation.db")
-    Path(config.db_path).parent.mkdir(parents=True, exist_ok=True)
-
-    adapter = SQLiteAdapter(config.db_path)
-    await adapter.initialize_schema()
-    runtime = CoreRuntime(adapter)
-    print("    ✓ Runtime создан")
-
-    # 2. Загрузка плагинов в правильном порядке
-    print("\n[2] Загрузка плагинов...")
-    
-    # System logger — должен быть первым
-    logger = SystemLoggerPlugin(runtime)
-    await runtime.plugin_manager.load_plugin(logger)
-    print("    ✓ system_logger загружен")
-    
-    # Devices domain — регистрируем как встроенный модуль
-    devices_module = DevicesModule(runtime)
-    await runtime.module_manager.register(devices_module)
-    print("    ✓ devices module зарегистрирован")
-    
-    # Automation — подписывается на события devices
-    automation = AutomationStubPlugin(runtime)
-    await runtime.plugin_manager.load_plugin(automation)
-    print("    ✓ automation_stub загружен")
-
-    # 3. Запуск runtime
-    print("\n[3] Запуск Runtime...")
-    await runtime.start()
-    print("    ✓ Runtime запущен")
+    # 1-3. Runtime (in-memory SQLite), system_logger, devices module и
+    # automation_stub поднимаются один раз на сессию фикстурой runtime (conftest.py)
+    runtime = clean_runtime
+    print("\n[1-3] Runtime запущен общей фикстурой")
 
     # 4. Проверка, что все плагины запущены
     print("\n[4] Проверка состояния плагинов...")
@@ -87,15 +57,15 @@ async def test_event_driven_automation():
 
     # 6. Проверка подписки на события
     print("\n[6] Проверка подписи на события...")
-    subscribers_count = await runtime.event_bus.get_subscribers_count("internal.device_command_requested")
-    print(f"    Подписчиков на 'internal.device_command_requested': {subscribers_count}")
+    subscribers_count = await runtime.event_bus.get_subscribers_count(EVT_CMD)
+    print(f"    Подписчиков на '{EVT_CMD}': {subscribers_count}")
     assert subscribers_count > 0, "automation_stub должен быть подписан на internal.device_command_requested"
     print("    ✓ Подписка на события подтверждена")
 
     # 7. Проверка цепочки: Event → Automation → Service → Logger
     print("\n[7] Демонстрация цепочки обработки...")
     
-    # Создаём устройство
+    # Создаём устройство (set_state зависит от create, поэтому не call_many)
     print("    Создаём устройство...")
     device = await runtime.service_registry.call(
         "devices.create",
@@ -114,8 +84,8 @@ async def test_event_driven_automation():
     )
     print(f"    ✓ Команда отправлена: {result}")
     
-    # Даём время на обработку события
-    await asyncio.sleep(0.2)
+    # Ждать не нужно: event_bus.publish() дожидается обработчиков,
+    # поэтому automation_stub уже обработал событие к возврату set_state
     
     print("\n    Цепочка обработки:")
     print("    ✓ devices.turn_on (сервис)")
@@ -132,11 +102,6 @@ async def test_event_driven_automation():
     print("    - что такое 'устройства'")
     print("    Это знают только плагины → ✓ Core остаётся 'глупым'")
 
-    # 9. Остановка runtime
-    print("\n[9] Остановка Runtime...")
-    await runtime.shutdown()
-    print("    ✓ Runtime остановлен")
-
     # Результат
     print("\n" + "=" * 70)
     print("✓ SMOKE-TEST УСПЕШНО ЗАВЕРШЕН")
@@ -151,4 +116,4 @@ async def test_event_driven_automation():
 
 
 if __name__ == "__main__":
-    asyncio.run(test_event_driven_automation())
+    pytest.main([__file__])
@@ -10,46 +10,43 @@ Smoke-test для модуля `presence`.
 
 import asyncio
 import pytest
-from pathlib import Path
 
-from core.config import Config
-from core.runtime import CoreRuntime
-from adapters.sqlite_adapter import SQLiteAdapter
-from plugins.test import SystemLoggerPlugin, AutomationStubPlugin
 
-
-@pytest.mark.asyncio
-async def test_presence():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_presence(clean_runtime):
     print("\nTEST: presence module integration")
 
-    config = Config(db_path="data/test_presence.db")
-    Path(config.db_path).parent.mkdir(parents=True, exist_ok=True)
+    # Общий runtime из conftest.py: in-memory SQLite, system_logger,
+    # automation_stub и встроенные модули (presence) уже запущены
+    runtime = clean_runtime
 
-    adapter = SQLiteAdapter(config.db_path)
-    await adapter.initialize_schema()
-    runtime = CoreRuntime(adapter)
+    # Барьеры вместо sleep: событие выставляется подписчиком presence.*
+    entered = asyncio.Event()
+    left = asyncio.Event()
 
-    logger = SystemLoggerPlugin(runtime)
-    await runtime.plugin_manager.load_plugin(logger)
+    def on_entered(event_type, data):
+        entered.set()
 
-    automation = AutomationStubPlugin(runtime)
-    await runtime.plugin_manager.load_plugin(automation)
+    def on_left(event_type, data):
+        left.set()
 
-    # PresenceModule регистрируется автоматически при runtime.start()
-    await runtime.start()
-    
-    # Даём время на инициализацию модулей
-    await asyncio.sleep(0.1)
+    await runtime.event_bus.subscribe("presence.entered", on_entered)
+    await runtime.event_bus.subscribe("presence.left", on_left)
+    try:
+        await _check_presence(runtime, entered, left)
+    finally:
+        # Runtime общий — подписки теста не должны пережить тест
+        await runtime.event_bus.unsubscribe("presence.entered", on_entered)
+        await runtime.event_bus.unsubscribe("presence.left", on_left)
+    print("OK")
 
+
+async def _check_presence(runtime, entered: asyncio.Event, left: asyncio.Event) -> None:
     # Проверка регистрации сервиса
-    services = await runtime.service_registry.list_services()
-    print("services:", services)
-    assert "presence.set" in services
+    assert await runtime.service_registry.has_service("presence.set")
 
     # Проверка HTTP контрактов
-    endpoints = runtime.http.list()
-    paths = [ep.path for ep in endpoints]
-    print("http paths:", paths)
+    paths = runtime.http.paths()
     assert "/presence/enter" in paths
     assert "/presence/leave" in paths
 
@@ -58,8 +55,8 @@ async def test_presence():
     cur = await runtime.state_engine.get("presence.home")
     if cur is None:
         # Инициализируем значение явно
+        # storage.set() сразу зеркалирует значение в state_engine
         await runtime.storage.set("presence", "home", {"value": False})
-        await asyncio.sleep(0.05)  # Даём время на синхронизацию
         cur = await runtime.state_engine.get("presence.home")
     
     print("initial presence.home:", cur)
@@ -69,7 +66,7 @@ async def test_presence():
 
     # Вызов presence.set True => presence.entered event
     await runtime.service_registry.call("presence.set", True)
-    await asyncio.sleep(0.1)
+    await asyncio.wait_for(entered.wait(), timeout=1.0)
     cur2 = await runtime.state_engine.get("presence.home")
     print("after set True:", cur2)
     cur2_val = cur2.get("value") if isinstance(cur2, dict) else cur2
@@ -77,15 +74,12 @@ async def test_presence():
 
     # Вызов presence.set False => presence.left event
     await runtime.service_registry.call("presence.set", False)
-    await asyncio.sleep(0.1)
+    await asyncio.wait_for(left.wait(), timeout=1.0)
     cur3 = await runtime.state_engine.get("presence.home")
     print("after set False:", cur3)
     cur3_val = cur3.get("value") if isinstance(cur3, dict) else cur3
     assert cur3_val is False
 
-    await runtime.shutdown()
-    print("OK")
-
 
 if __name__ == '__main__':
-    asyncio.run(test_presence())
+    pytest.main([__file__])
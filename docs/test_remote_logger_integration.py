@@ -10,16 +10,31 @@ Smoke-test для архитектуры remote plugins.
 
 import asyncio
 import pytest
-from pathlib import Path
 
 from core.config import Config
 from core.runtime import CoreRuntime
-from adapters.sqlite_adapter import SQLiteAdapter
+from core.storage_factory import create_storage_adapter
 from plugins.test import SystemLoggerPlugin
 from modules import DevicesModule
 from plugins.remote_plugin_proxy import RemotePluginProxy
 
 
+# Ответы мокированного удалённого плагина: endpoint -> JSON
+_RESPONSES = {
+    "/plugin/metadata": {
+        "name": "remote_logger",
+        "version": "0.1.0",
+        "type": "system",
+        "mode": "remote",
+        "description": "Логирование как удалённый сервис",
+    },
+    "/plugin/load": {"status": "ok", "message": "plugin loaded"},
+    "/plugin/start": {"status": "ok", "message": "plugin started"},
+    "/plugin/stop": {"status": "ok", "message": "plugin stopped"},
+    "/plugin/unload": {"status": "ok", "message": "plugin unloaded"},
+}
+
+
 @pytest.mark.asyncio
 async def test_remote_plugin_proxy_architecture():
     """Smoke-тест архитектуры remote plugins."""
@@ -30,11 +45,10 @@ async def test_remote_plugin_proxy_architecture():
 
     # 1. Инициализация Core Runtime (без изменений)
     print("\n[1] Инициализация Core Runtime (БЕЗ изменений)...")
-    config = Config(db_path="data/test_remote_proxy.db")
-    Path(config.db_path).parent.mkdir(parents=True, exist_ok=True)
+    config = Config(db_path=":memory:")
 
-    adapter = SQLiteAdapter(config.db_path)
-    await adapter.initialize_schema()
+    # Фабрика — единственная точка создания адаптера и инициализации схемы
+    adapter = await create_storage_adapter(config)
     runtime = CoreRuntime(adapter)
     print("    ✓ Core Runtime инициализирован (никаких изменений в Core)")
 
@@ -62,24 +76,10 @@ async def test_remote_plugin_proxy_architecture():
     # Мокируем _http_call для имитации удалённого сервиса
     async def mock_http_call(endpoint, method="GET", json_data=None):
         """Мокирует HTTP ответы от удалённого плагина."""
-        if endpoint == "/plugin/metadata":
-            return {
-                "name": "remote_logger",
-                "version": "0.1.0",
-                "type": "system",
-                "mode": "remote",
-                "description": "Логирование как удалённый сервис",
-            }
-        elif endpoint == "/plugin/load":
-            return {"status": "ok", "message": "plugin loaded"}
-        elif endpoint == "/plugin/start":
-            return {"status": "ok", "message": "plugin started"}
-        elif endpoint == "/plugin/stop":
-            return {"status": "ok", "message": "plugin stopped"}
-        elif endpoint == "/plugin/unload":
-            return {"status": "ok", "message": "plugin unloaded"}
-        else:
-            raise ValueError(f"Unknown endpoint: {endpoint}")
+        try:
+            return _RESPONSES[endpoint]
+        except KeyError:
+            raise ValueError(f"Unknown endpoint: {endpoint}") from None
     
     remote_proxy._http_call = mock_http_call
     
@@ -5,6 +5,8 @@
 """
 
 import asyncio
+import logging
+import os
 import signal
 from pathlib import Path
 
@@ -13,15 +15,21 @@ from core.runtime import CoreRuntime
 from core.storage_factory import create_storage_adapter
 
 
+# Логгер точки входа; уровень — из LOG_LEVEL, как у LoggerModule
+log = logging.getLogger("runtime")
+
+
 async def main():
     """Главная функция запуска Core Runtime."""
     
     # Загрузить конфигурацию
     config = Config.from_env()
     
-    # Создать директорию для БД, если нужно (только для SQLite)
-    if config.storage_type == "sqlite":
-        Path(config.db_path).parent.mkdir(parents=True, exist_ok=True)
+    # Создать директорию для БД, если нужно (только для SQLite) — вне event loop
+    if config.storage_type == "sqlite" and config.db_path != ":memory:":
+        await asyncio.to_thread(
+            Path(config.db_path).parent.mkdir, parents=True, exist_ok=True
+        )
     
     # Создать storage адаптер на основе конфигурации
     storage_adapter = await create_storage_adapter(config)
@@ -31,48 +39,52 @@ async def main():
     # Передаём config для поддержки shutdown_timeout
     runtime = CoreRuntime(storage_adapter, config=config)
     
-    # Диагностика: показать, какие модули и плагины зарегистрированы
-    try:
-        modules = runtime.module_manager.list_modules()
-        if modules:
-            print(f"[Runtime] Модули зарегистрированы: {modules}")
-    except Exception:
-        pass
+    # Диагностика: показать, какие модули зарегистрированы (только при DEBUG,
+    # чтобы не собирать список и не форматировать строку без надобности)
+    if log.isEnabledFor(logging.DEBUG):
+        try:
+            modules = runtime.module_manager.list_modules()
+            if modules:
+                log.debug("Модули зарегистрированы: %s", modules)
+        except Exception:
+            pass
     
-    # Обработка сигналов для graceful shutdown
+    # Обработка сигналов для graceful shutdown:
+    # сигнал напрямую взводит событие, сообщение пишет main() после пробуждения
     shutdown_event = asyncio.Event()
     
-    def signal_handler():
-        """Обработчик сигналов остановки."""
-        print("\n[Runtime] Получен сигнал остановки...")
-        shutdown_event.set()
-    
     # Зарегистрировать обработчики сигналов
     loop = asyncio.get_running_loop()
     for sig in (signal.SIGTERM, signal.SIGINT):
-        loop.add_signal_handler(sig, signal_handler)
+        loop.add_signal_handler(sig, shutdown_event.set)
     
     try:
         # Запустить Runtime
-        print("[Runtime] Запуск Core Runtime...")
+        log.info("Запуск Core Runtime...")
         await runtime.start()
-        print("[Runtime] Core Runtime запущен")
+        log.info("Core Runtime запущен")
         
         # Ждать сигнала остановки
         await shutdown_event.wait()
+        log.info("Получен сигнал остановки...")
         
     finally:
         # Остановить Runtime
-        print("[Runtime] Остановка Core Runtime...")
+        log.info("Остановка Core Runtime...")
         try:
             await asyncio.wait_for(
                 runtime.shutdown(),
                 timeout=config.shutdown_timeout
             )
-            print("[Runtime] Core Runtime остановлен")
+            log.info("Core Runtime остановлен")
         except asyncio.TimeoutError:
-            print("[Runtime] Таймаут при остановке Runtime")
+            log.warning("Таймаут при остановке Runtime")
 
 
 if __name__ == "__main__":
+    # Настраиваем только логгер точки входа; root logger не трогаем
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("[Runtime] %(message)s"))
+    log.addHandler(handler)
+    log.setLevel(getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO))
     asyncio.run(main())
@@ -1,8 +1,43 @@
-from .devices import DevicesModule
-from .automation import AutomationModule
-from .presence import PresenceModule
-from .logger import LoggerModule
-from .api import ApiModule
-from .admin import AdminModule
-
-__all__ = ["DevicesModule", "AutomationModule", "PresenceModule", "LoggerModule", "ApiModule", "AdminModule"]
\ No newline at end of file
+"""
+Встроенные модули Core Runtime.
+
+Классы модулей импортируются лениво (PEP 562): `from modules import DevicesModule`
+загружает только modules.devices, а не все встроенные модули сразу.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Имя класса -> подмодуль, в котором он определён
+_LAZY = {
+    "DevicesModule": ".devices",
+    "AutomationModule": ".automation",
+    "PresenceModule": ".presence",
+    "LoggerModule": ".logger",
+    "ApiModule": ".api",
+    "AdminModule": ".admin",
+}
+
+__all__ = ["DevicesModule", "AutomationModule", "PresenceModule", "LoggerModule", "ApiModule", "AdminModule"]
+
+if TYPE_CHECKING:
+    from .devices import DevicesModule
+    from .automation import AutomationModule
+    from .presence import PresenceModule
+    from .logger import LoggerModule
+    from .api import ApiModule
+    from .admin import AdminModule
+
+
+def __getattr__(name: str) -> Any:
+    submodule = _LAZY.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    obj = getattr(importlib.import_module(submodule, __name__), name)
+    # Кешируем в globals модуля: следующие обращения не доходят до __getattr__
+    globals()[name] = obj
+    return obj
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -54,6 +54,10 @@ class LoggerModule(RuntimeModule):
 
         # Регистрируем сервис logger.log
         await self.runtime.service_registry.register("logger.log", self._log_service)
+        # Эффективный уровень — чтобы вызывающие могли не строить отфильтрованные логи
+        await self.runtime.service_registry.register(
+            "logger.get_effective_level", self._get_effective_level
+        )
 
     async def start(self) -> None:
         """
@@ -92,12 +96,23 @@ class LoggerModule(RuntimeModule):
         except Exception:
             pass
 
-        # Отменяем регистрацию сервиса
+        # Отменяем регистрацию сервисов
         try:
             await self.runtime.service_registry.unregister("logger.log")
+            await self.runtime.service_registry.unregister("logger.get_effective_level")
         except Exception:
             pass
 
+    async def _get_effective_level(self) -> int:
+        """
+        Сервис получения эффективного уровня логирования.
+        
+        Returns:
+            Уровень logging (например, logging.INFO = 20); сообщения ниже
+            этого уровня logger.log отбрасывает
+        """
+        return self._log_level
+
     async def _log_service(self, level: str, message: str, **context: Any) -> None:
         """
         Сервис логирования.
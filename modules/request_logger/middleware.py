@@ -5,7 +5,7 @@ Middleware для перехвата HTTP запросов и записи ло
 import uuid
 import time
 from typing import Any, Callable, Optional
-from contextvars import ContextVar
+from contextvars import ContextVar, Token
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
@@ -50,6 +50,20 @@ def set_operation_id(operation_id: str) -> None:
     _operation_id_var.set(operation_id)
 
 
+def push_operation_id(operation_id: str) -> Token:
+    """Установить operation_id и вернуть Token для reset_operation_id()."""
+    return _operation_id_var.set(operation_id)
+
+
+def reset_operation_id(token: Token) -> None:
+    """Вернуть operation_id, действовавший до push_operation_id()."""
+    try:
+        _operation_id_var.reset(token)
+    except ValueError:
+        # Token создан в другом контексте (выход из operation() в другой задаче)
+        _operation_id_var.set(None if token.old_value is Token.MISSING else token.old_value)
+
+
 async def request_logger_middleware(request: Request, call_next: Callable) -> Response:
     """
     Middleware для перехвата HTTP запросов и записи логов.
@@ -71,14 +71,21 @@ class YandexSmartHomeStubPlugin(BasePlugin):
             ]
 
             # Для каждого устройства публикуем событие обнаружения
-            for device in devices:
-                await self.runtime.event_bus.publish("external.device_discovered", {
+            discovered = [
+                {
                     "provider": "yandex",
                     "external_id": device["external_id"],
                     "type": device["type"],
                     "capabilities": device["capabilities"],
                     "state": device["state"],
-                })
+                }
+                for device in devices
+            ]
+            for payload in discovered:
+                await self.runtime.event_bus.publish("external.device_discovered", payload)
+
+            # И одно пакетное событие со всем списком
+            await self.runtime.event_bus.publish("external.devices_discovered", {"devices": discovered})
 
             return devices
 
@@ -34,7 +34,8 @@ class DeviceSync:
         2. Получить токены из oauth_yandex.get_tokens()
         3. Выполнить HTTP GET к https://api.iot.yandex.net/v1.0/user/info
         4. Преобразовать каждое устройство в стандартный формат
-        5. Опубликовать external.device_discovered для каждого
+        5. Опубликовать external.device_discovered для каждого и один
+           пакетный external.devices_discovered со всем списком
         6. Вернуть список преобразованных устройств
 
         Returns:
@@ -148,4 +149,23 @@ class DeviceSync:
                     except Exception:
                         pass
 
+        # Пакетное событие: подписчик получает весь список за один вызов
+        # вместо N отдельных external.device_discovered
+        if devices:
+            try:
+                await self.runtime.event_bus.publish(
+                    "external.devices_discovered",
+                    {"devices": devices}
+                )
+            except Exception as e:
+                try:
+                    await self.runtime.service_registry.call(
+                        "logger.log",
+                        level="warning",
+                        message=f"Ошибка публикации пакетного события устройств: {e}",
+                        plugin=self.plugin_name,
+                    )
+                except Exception:
+                    pass
+
         return devices
@@ -8,6 +8,44 @@ from __future__ import annotations
 from typing import Any, Dict, Optional
 
 
+# Полный тип Яндекса -> простой тип (последний сегмент после точки).
+# Известные типы заполнены заранее; неизвестные разбираются на каждый вызов
+# и не кэшируются — типы приходят из внешнего API, и таблица не должна расти.
+_DEVICE_TYPE_MAP: Dict[str, str] = {
+    yandex_type: yandex_type.rsplit(".", 1)[-1]
+    for yandex_type in (
+        "devices.types.light",
+        "devices.types.socket",
+        "devices.types.switch",
+        "devices.types.thermostat",
+        "devices.types.thermostat.ac",
+        "devices.types.media_device",
+        "devices.types.media_device.tv",
+        "devices.types.media_device.tv_box",
+        "devices.types.media_device.receiver",
+        "devices.types.cooking",
+        "devices.types.cooking.coffee_maker",
+        "devices.types.cooking.kettle",
+        "devices.types.cooking.multicooker",
+        "devices.types.openable",
+        "devices.types.openable.curtain",
+        "devices.types.humidifier",
+        "devices.types.purifier",
+        "devices.types.vacuum_cleaner",
+        "devices.types.washing_machine",
+        "devices.types.dishwasher",
+        "devices.types.iron",
+        "devices.types.sensor",
+        "devices.types.sensor.climate",
+        "devices.types.sensor.motion",
+        "devices.types.sensor.door",
+        "devices.types.sensor.water_leak",
+        "devices.types.smart_speaker",
+        "devices.types.other",
+    )
+}
+
+
 class DeviceTransformer:
     """Класс для трансформации устройств Яндекс API."""
 
@@ -125,11 +163,11 @@ class DeviceTransformer:
         if not yandex_type:
             return "unknown"
 
-        # Извлекаем последнюю часть после последней точки
-        parts = yandex_type.split(".")
-        if parts:
-            return parts[-1]
-        return "unknown"
+        device_type = _DEVICE_TYPE_MAP.get(yandex_type)
+        if device_type is None:
+            # Неизвестный тип: последняя часть после последней точки
+            device_type = yandex_type.rsplit(".", 1)[-1]
+        return device_type
 
     @staticmethod
     def _extract_capabilities(yandex_capabilities: list) -> list[str]:
@@ -28,6 +28,7 @@
 
 Публикует события:
 - external.device_discovered для каждого полученного устройства
+- external.devices_discovered один раз со списком всех устройств
 - external.device_state_reported для realtime обновлений
 
 Ограничения:
@@ -55,6 +56,7 @@ class YandexSmartHomeRealPlugin(BasePlugin):
 
     Публикует события:
     - external.device_discovered для каждого полученного устройства
+    - external.devices_discovered один раз со списком всех устройств
 
     Взаимодействует только через:
     - event_bus (публикация событий)
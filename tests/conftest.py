@@ -18,6 +18,10 @@ class InMemoryStorageAdapter(StorageAdapter):
     async def get(self, namespace: str, key: str):
         return self._data.get(namespace, {}).get(key)
 
+    async def batch_get(self, namespace: str, keys: list[str]) -> dict[str, dict]:
+        ns = self._data.get(namespace, {})
+        return {k: ns[k] for k in keys if k in ns}
+
     async def set(self, namespace: str, key: str, value: dict):
         self._data.setdefault(namespace, {})[key] = value
 
@@ -31,6 +35,11 @@ class InMemoryStorageAdapter(StorageAdapter):
     async def list_keys(self, namespace: str) -> list[str]:
         return list(self._data.get(namespace, {}).keys())
 
+    async def iter_keys(self, namespace: str, prefix: str = "", limit=None):
+        keys = sorted(k for k in self._data.get(namespace, {}) if k.startswith(prefix))
+        for k in keys[:limit]:
+            yield k
+
     async def clear_namespace(self, namespace: str) -> None:
         self._data.pop(namespace, None)
 
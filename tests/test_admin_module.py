@@ -61,3 +61,181 @@ async def test_admin_runtime_endpoint(memory_adapter):
         pass
     
     await runtime.stop()
+
+
+@pytest.mark.asyncio
+async def test_admin_storage_counts_keys_per_namespace():
+    """Тест: admin.v1.storage возвращает количество ключей по namespace (SQLite)."""
+    from adapters.sqlite_adapter import SQLiteAdapter
+
+    adapter = SQLiteAdapter(":memory:")
+    await adapter.initialize_schema()
+    runtime = CoreRuntime(adapter)
+    await runtime.start()
+
+    await runtime.storage.set("ns_a", "k1", {"v": 1})
+    await runtime.storage.set("ns_a", "k2", {"v": 2})
+    await runtime.storage.set("ns_b", "k1", {"v": 3})
+
+    result = await runtime.service_registry.call("admin.v1.storage")
+    counts = {row["namespace"]: row["keys_count"] for row in result}
+    assert counts["ns_a"] == 2
+    assert counts["ns_b"] == 1
+
+    await runtime.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_admin_auth_list_api_keys_and_users(memory_adapter):
+    """Тест: списки API ключей и пользователей (истёкшие ключи скрыты, новые первыми)."""
+    import time
+
+    runtime = CoreRuntime(memory_adapter)
+    await runtime.start()
+
+    now = time.time()
+    await runtime.storage.set("auth_api_keys", "key-old", {"subject": "old", "created_at": now - 10})
+    await runtime.storage.set("auth_api_keys", "key-new", {"subject": "new", "created_at": now})
+    await runtime.storage.set(
+        "auth_api_keys", "key-expired", {"subject": "expired", "created_at": now, "expires_at": now - 1}
+    )
+    await runtime.storage.set("auth_users", "u1", {"username": "alice", "scopes": ["read"]})
+
+    keys = await runtime.service_registry.call("admin.auth.list_api_keys")
+    assert [k["subject"] for k in keys] == ["new", "old"]
+
+    users = await runtime.service_registry.call("admin.auth.list_users")
+    assert [(u["user_id"], u["username"]) for u in users] == [("u1", "alice")]
+
+    await runtime.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_admin_plugins_counts_services_and_http(memory_adapter):
+    """Тест: admin.v1.plugins считает сервисы и HTTP endpoints плагина."""
+    from core.base_plugin import BasePlugin, PluginMetadata
+    from core.http_registry import HttpEndpoint
+
+    class CountedPlugin(BasePlugin):
+        @property
+        def metadata(self) -> PluginMetadata:
+            return PluginMetadata(name="counted", version="1.0.0")
+
+        async def on_load(self) -> None:
+            async def noop():
+                return None
+
+            await self.runtime.service_registry.register("counted.a", noop)
+            await self.runtime.service_registry.register("counted.b", noop)
+            self.runtime.http.register(HttpEndpoint(method="GET", path="/counted/a", service="counted.a"))
+
+    runtime = CoreRuntime(memory_adapter)
+    await runtime.plugin_manager.load_plugin(CountedPlugin(runtime))
+    await runtime.start()
+
+    plugins = await runtime.service_registry.call("admin.v1.plugins")
+    counted = next(p for p in plugins if p["name"] == "counted")
+    assert counted["services_count"] == 2
+    assert counted["http_count"] == 1
+
+    await runtime.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_admin_events_and_plugins_share_handler_snapshot(memory_adapter):
+    """Тест: admin.v1.events и admin.v1.plugins строятся из одного снимка подписок."""
+    from core.base_plugin import BasePlugin, PluginMetadata
+
+    class ListeningPlugin(BasePlugin):
+        @property
+        def metadata(self) -> PluginMetadata:
+            return PluginMetadata(name="listening", version="1.0.0")
+
+        async def on_load(self) -> None:
+            await self.runtime.event_bus.subscribe("test.ping", self.on_ping)
+
+        async def on_ping(self, event_type, data):
+            pass
+
+    runtime = CoreRuntime(memory_adapter)
+    await runtime.plugin_manager.load_plugin(ListeningPlugin(runtime))
+    await runtime.start()
+
+    events = await runtime.service_registry.call("admin.v1.events")
+    ping = next(e for e in events if e["event_name"] == "test.ping")
+    assert ping["subscribers"] == [{"plugin": "listening", "handler": "on_ping"}]
+
+    plugins = await runtime.service_registry.call("admin.v1.plugins")
+    listening = next(p for p in plugins if p["name"] == "listening")
+    assert listening["event_subscriptions"] == ["test.ping"]
+
+    # Новая подписка видна сразу, ответы не разделяют изменяемые объекты
+    async def on_pong(event_type, data):
+        pass
+
+    await runtime.event_bus.subscribe("test.pong", on_pong)
+    ping["subscribers"].clear()
+    events = await runtime.service_registry.call("admin.v1.events")
+    assert any(e["event_name"] == "test.pong" for e in events)
+    ping = next(e for e in events if e["event_name"] == "test.ping")
+    assert ping["subscribers"] == [{"plugin": "listening", "handler": "on_ping"}]
+
+    await runtime.shutdown()
+
+
+def test_owner_of():
+    """Тест: владелец сервиса — префикс имени до первой точки."""
+    from modules.admin.module import _owner_of
+
+    assert _owner_of("devices.list") == "devices"
+    assert _owner_of("admin.v1.runtime") == "admin"
+    assert _owner_of("plain") == ""
+    assert _owner_of(".hidden") == ""
+
+
+@pytest.mark.asyncio
+async def test_admin_auth_list_api_keys_sqlite():
+    """Тест: на SQLite фильтр истёкших ключей и сортировка выполняются в SQL."""
+    import time
+    from adapters.sqlite_adapter import SQLiteAdapter
+
+    adapter = SQLiteAdapter(":memory:")
+    await adapter.initialize_schema()
+    runtime = CoreRuntime(adapter)
+    await runtime.start()
+
+    now = time.time()
+    await runtime.storage.set("auth_api_keys", "key-old", {"subject": "old", "created_at": now - 10})
+    await runtime.storage.set(
+        "auth_api_keys", "key-new", {"subject": "new", "created_at": now, "expires_at": now + 3600}
+    )
+    await runtime.storage.set(
+        "auth_api_keys", "key-expired", {"subject": "expired", "created_at": now, "expires_at": now - 1}
+    )
+
+    admin = runtime.module_manager.get_module("admin")
+    rows = await admin._query_active_api_keys(time.time())
+    assert [key for key, _ in rows] == ["key-new", "key-old"]
+
+    keys = await runtime.service_registry.call("admin.auth.list_api_keys")
+    assert [k["subject"] for k in keys] == ["new", "old"]
+
+    await runtime.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_admin_snapshot_matches_individual_endpoints(memory_adapter):
+    """Тест: admin.v1.snapshot совпадает с отдельными admin.v1.* endpoints."""
+    runtime = CoreRuntime(memory_adapter)
+    await runtime.start()
+
+    snapshot = await runtime.service_registry.call("admin.v1.snapshot")
+    call = runtime.service_registry.call
+    assert snapshot["plugins"] == await call("admin.v1.plugins")
+    assert snapshot["services"] == await call("admin.v1.services")
+    assert snapshot["http"] == await call("admin.v1.http")
+    assert snapshot["events"] == await call("admin.v1.events")
+    assert snapshot["runtime"]["version"] == (await call("admin.v1.runtime"))["version"]
+    assert "/admin/v1/snapshot" in runtime.http.paths()
+
+    await runtime.shutdown()
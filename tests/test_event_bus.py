@@ -68,3 +68,25 @@ async def test_subscribers_count_and_clear():
     assert await bus.get_subscribers_count('x') == 2
     await bus.clear()
     assert await bus.get_subscribers_count('x') == 0
+
+
+@pytest.mark.asyncio
+async def test_publish_calls_sync_handlers_inline():
+    bus = EventBus()
+    received = []
+
+    def sync_handler(event_type, data):
+        received.append(('sync', data['x']))
+
+    def bad_sync(event_type, data):
+        raise ValueError('boom')
+
+    async def async_handler(event_type, data):
+        received.append(('async', data['x']))
+
+    await bus.subscribe('e', bad_sync)
+    await bus.subscribe('e', sync_handler)
+    await bus.subscribe('e', async_handler)
+
+    await bus.publish('e', {'x': 1})
+    assert received == [('sync', 1), ('async', 1)]
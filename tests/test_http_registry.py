@@ -0,0 +1,25 @@
+"""
+Тесты для HttpRegistry.
+"""
+
+from core.http_registry import HttpEndpoint, HttpRegistry
+
+
+def test_paths_reflects_register_and_clear():
+    registry = HttpRegistry()
+    registry.register(HttpEndpoint(method="POST", path="/presence/enter/", service="presence.enter"))
+    registry.register(HttpEndpoint(method="GET", path="/devices", service="devices.list"))
+
+    paths = registry.paths()
+    assert paths == frozenset({"/presence/enter", "/devices"})
+    # Без изменений возвращается тот же закэшированный объект
+    assert registry.paths() is paths
+
+    registry.register(HttpEndpoint(method="GET", path="/devices", service="devices.list", version="v1"))
+    assert "/v1/devices" in registry.paths()
+
+    registry.clear("presence")
+    assert "/presence/enter" not in registry.paths()
+
+    registry.clear()
+    assert registry.paths() == frozenset()
@@ -1,6 +1,7 @@
 import os
 import sys
 import asyncio
+import logging
 from types import SimpleNamespace
 
 import pytest
@@ -51,6 +52,8 @@ async def test_log_service_filters_and_prints(monkeypatch, capsys):
     monkeypatch.setenv("LOG_LEVEL", "WARNING")
     await mod.register()
 
+    assert await reg._services["logger.get_effective_level"]() == logging.WARNING
+
     # info level should be filtered out
     await reg._services["logger.log"](level="info", message="should be ignored", module="testmod")
     captured = capsys.readouterr()
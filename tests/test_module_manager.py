@@ -2,6 +2,8 @@
 Тесты для ModuleManager.
 """
 
+import asyncio
+
 import pytest
 
 from core.module_manager import ModuleManager
@@ -151,6 +153,36 @@ async def test_start_all_handles_errors():
     assert module3.started is True
 
 
+@pytest.mark.asyncio
+async def test_start_all_runs_modules_concurrently():
+    """Тест, что start() модулей выполняются параллельно, а не по очереди."""
+    manager = ModuleManager()
+    runtime = object()
+    first_started = asyncio.Event()
+
+    class WaitingModule(MockModule):
+        async def start(self) -> None:
+            # Дождётся только если второй модуль стартует одновременно
+            await asyncio.wait_for(first_started.wait(), timeout=1.0)
+            self.started = True
+
+    class SignallingModule(MockModule):
+        async def start(self) -> None:
+            first_started.set()
+            self.started = True
+
+    module1 = WaitingModule(runtime, "module1")
+    module2 = SignallingModule(runtime, "module2")
+
+    await manager.register(module1)
+    await manager.register(module2)
+
+    await manager.start_all()
+
+    assert module1.started is True
+    assert module2.started is True
+
+
 @pytest.mark.asyncio
 async def test_stop_all_handles_errors():
     """Тест, что ошибка в одном модуле не ломает остановку других."""
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import uuid
+
+import pytest
+
+from core.service_registry import ServiceRegistry
+from core.utils import operation as operation_module
+from core.utils.operation import operation
+from modules.request_logger.middleware import get_operation_id, set_operation_id
+
+
+async def _drain_log_tasks():
+    # Логи операций пишутся фоновыми задачами
+    await asyncio.gather(*list(operation_module._LOG_TASKS))
+
+
+class _Runtime:
+    is_running = True
+
+    def __init__(self):
+        self.service_registry = ServiceRegistry()
+
+
+def test_operation_ids_are_unique_uuid4():
+    operation_module._ID_POOL.clear()
+    ids = [operation_module._new_operation_id() for _ in range(operation_module._ID_POOL_SIZE * 2 + 1)]
+    assert len(set(ids)) == len(ids)
+    for op_id in ids:
+        parsed = uuid.UUID(op_id)
+        assert parsed.version == 4
+        assert parsed.variant == uuid.RFC_4122
+        assert str(parsed) == op_id
+
+
+@pytest.mark.asyncio
+async def test_operation_logs_start_ok_error():
+    runtime = _Runtime()
+    logs = []
+
+    async def log(**kwargs):
+        logs.append(kwargs)
+
+    await runtime.service_registry.register("logger.log", log)
+
+    async with operation("oauth.refresh_token", "oauth", runtime) as op_id:
+        assert get_operation_id() == op_id
+
+    with pytest.raises(RuntimeError):
+        async with operation("demo.fail", "demo", runtime):
+            raise RuntimeError("boom")
+    await _drain_log_tasks()
+
+    assert [entry["message"] for entry in logs] == [
+        "Refreshing OAuth token",
+        "OAuth token refreshed",
+        "operation.start",
+        "operation.error",
+    ]
+    assert logs[0]["operation_id"] == op_id
+    assert logs[0]["origin"] == "system"
+    assert logs[3]["level"] == "error"
+    assert logs[3]["error_type"] == "RuntimeError"
+
+
+@pytest.mark.asyncio
+async def test_operation_without_logger_restores_previous_id():
+    set_operation_id("outer")
+    async with operation("demo.op", "demo", _Runtime()) as op_id:
+        assert op_id != "outer"
+    assert get_operation_id() == "outer"
+
+
+@pytest.mark.asyncio
+async def test_nested_operations_restore_each_level():
+    async def run():
+        async with operation("demo.outer", "demo") as outer_id:
+            async with operation("demo.inner", "demo") as inner_id:
+                assert get_operation_id() == inner_id
+            assert get_operation_id() == outer_id
+        assert get_operation_id() is None
+
+    # Отдельная задача — чистый контекст без operation_id
+    await asyncio.create_task(run())
+
+
+@pytest.mark.asyncio
+async def test_operation_skips_info_logs_filtered_by_logger_level():
+    runtime = _Runtime()
+    logs = []
+
+    async def log(**kwargs):
+        logs.append(kwargs)
+
+    async def get_effective_level():
+        return logging.WARNING
+
+    await runtime.service_registry.register("logger.log", log)
+    await runtime.service_registry.register("logger.get_effective_level", get_effective_level)
+
+    async with operation("demo.ok", "demo", runtime):
+        pass
+    with pytest.raises(ValueError):
+        async with operation("demo.fail", "demo", runtime):
+            raise ValueError("bad")
+    await _drain_log_tasks()
+
+    assert [entry["message"] for entry in logs] == ["operation.error"]
+
+
+@pytest.mark.asyncio
+async def test_operation_registers_metadata_only_for_external_prefixes():
+    runtime = _Runtime()
+    registered = []
+
+    async def set_request_metadata(request_id, request_metadata):
+        registered.append(request_metadata["path"])
+
+    await runtime.service_registry.register("request_logger.set_request_metadata", set_request_metadata)
+
+    async with operation("yandex.check_online", "yandex_smart_home", runtime):
+        pass
+    async with operation("local.cleanup", "demo", runtime):
+        pass
+
+    assert registered == ["/system/yandex_smart_home/yandex.check_online"]
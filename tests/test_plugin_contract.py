@@ -5,9 +5,11 @@
 - docs/08-PLUGIN-CONTRACT.md
 """
 
+import asyncio
 import json
 import pytest
 import tempfile
+import threading
 from pathlib import Path
 from unittest.mock import patch
 
@@ -194,6 +196,72 @@ async def test_plugin_load_order_by_dependencies(memory_adapter):
             setattr(manager, '_load_plugin_from_manifest', original_load)
 
 
+@pytest.mark.asyncio
+async def test_independent_plugins_load_concurrently(memory_adapter):
+    """Тест: плагины без взаимных зависимостей загружаются параллельно (одной волной)."""
+    runtime = CoreRuntime(memory_adapter)
+    manager = runtime.plugin_manager
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        plugins_dir = Path(tmpdir)
+        
+        for name in ("plugin_a", "plugin_b"):
+            plugin_dir = plugins_dir / name
+            plugin_dir.mkdir()
+            create_manifest_file(plugin_dir, name, "tests.test_plugin_contract.DummyPlugin", [])
+        
+        # Каждый плагин ждёт, пока начнётся загрузка второго:
+        # при последовательной загрузке это зависло бы до timeout
+        started = []
+        both_started = asyncio.Event()
+        
+        original_load = manager._load_plugin_from_manifest
+        
+        async def tracked_load(manifest, plugin_dir, actual_logger_func):
+            started.append(manifest.get("name"))
+            if len(started) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), timeout=1.0)
+            await manager.load_plugin(DummyPlugin(runtime, name=manifest.get("name")))
+            return True
+        
+        setattr(manager, '_load_plugin_from_manifest', tracked_load)
+        
+        try:
+            await manager.auto_load_plugins(plugins_dir=plugins_dir)
+            assert sorted(manager.list_plugins()) == ["plugin_a", "plugin_b"]
+        finally:
+            setattr(manager, '_load_plugin_from_manifest', original_load)
+
+
+class LoopRecordingPlugin(DummyPlugin):
+    """Плагин, обращающийся к event loop из конструктора."""
+    
+    def __init__(self, runtime=None):
+        super().__init__(runtime, name="loop_recording")
+        self.ready = asyncio.get_running_loop().create_future()
+        self.constructed_in = threading.current_thread()
+
+
+@pytest.mark.asyncio
+async def test_manifest_plugin_constructed_on_event_loop(memory_adapter):
+    """Тест: экземпляр плагина из манифеста создаётся в потоке event loop."""
+    runtime = CoreRuntime(memory_adapter)
+    manager = runtime.plugin_manager
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        plugin_dir = Path(tmpdir) / "loop_recording"
+        plugin_dir.mkdir()
+        create_manifest_file(
+            plugin_dir, "loop_recording", "tests.test_plugin_contract.LoopRecordingPlugin", []
+        )
+        
+        await manager.auto_load_plugins(plugins_dir=Path(tmpdir))
+    
+    assert "loop_recording" in manager.list_plugins()
+    assert manager._plugins["loop_recording"].constructed_in is threading.current_thread()
+
+
 @pytest.mark.asyncio
 async def test_plugin_missing_dependency_not_loaded(memory_adapter):
     """Тест: плагин с отсутствующей зависимостью НЕ загружается."""
@@ -72,3 +72,23 @@ async def test_load_error_sets_state():
     with pytest.raises(RuntimeError):
         await pm.load_plugin(bad)
     assert pm.get_plugin_state('bad') == PluginState.ERROR
+
+
+@pytest.mark.asyncio
+async def test_load_plugins_batch():
+    pm = PluginManager()
+    plugins = [DummyPlugin(None, name='a'), DummyPlugin(None, name='b')]
+    await pm.load_plugins(plugins)
+    assert set(pm.list_plugins()) == {'a', 'b'}
+    assert all(p.loaded for p in plugins)
+
+
+@pytest.mark.asyncio
+async def test_load_plugins_batch_error_does_not_stop_others():
+    pm = PluginManager()
+    good = DummyPlugin(None, name='good')
+    bad = BadLoadPlugin(None, name='bad')
+    with pytest.raises(RuntimeError):
+        await pm.load_plugins([bad, good])
+    assert pm.get_plugin_state('good') == PluginState.LOADED
+    assert pm.get_plugin_state('bad') == PluginState.ERROR
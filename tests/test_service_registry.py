@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from core.service_registry import ServiceRegistry
@@ -50,3 +52,43 @@ async def test_unregister_and_clear():
     await sr.register('a', f)
     await sr.clear()
     assert await sr.list_services() == []
+
+
+@pytest.mark.asyncio
+async def test_call_many_runs_concurrently_in_order():
+    sr = ServiceRegistry()
+    started = []
+    release = asyncio.Event()
+
+    async def slow(x):
+        started.append(x)
+        await release.wait()
+        return x * 2
+
+    async def fast(x, y=0):
+        started.append(x)
+        # Оба вызова уже запущены — отпускаем медленный
+        release.set()
+        return x + y
+
+    await sr.register('slow', slow)
+    await sr.register('fast', fast)
+
+    results = await sr.call_many([
+        ('slow', (1,), {}),
+        ('fast', (2,), {'y': 3}),
+    ])
+    assert results == [2, 5]
+    assert started == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_call_many_missing_raises():
+    sr = ServiceRegistry()
+
+    async def f():
+        return 1
+
+    await sr.register('f', f)
+    with pytest.raises(ValueError):
+        await sr.call_many([('f', (), {}), ('nope', (), {})])
@@ -37,3 +37,70 @@ async def test_concurrent_set():
     await asyncio.gather(*(set_n(i) for i in range(50)))
     keys = await s.keys()
     assert len(keys) == 50
+
+
+@pytest.mark.asyncio
+async def test_ttl_expires_lazily_without_sweeper():
+    s = StateEngine()
+
+    await s.set_with_ttl('t', 1, ttl_seconds=0.01)
+    await s.set('p', 2)
+    assert s._expiry_handles == {}
+    assert await s.exists('t') is True
+
+    await asyncio.sleep(0.02)
+    assert await s.exists('t') is False
+    assert await s.get('t') is None
+    assert await s.keys() == ['p']
+
+
+@pytest.mark.asyncio
+async def test_sweep_removes_abandoned_ttl_keys():
+    s = StateEngine()
+
+    await s.set_with_ttl('a', 1, ttl_seconds=0.01)
+    await s.set_with_ttl('b', 2, ttl_seconds=60)
+    await asyncio.sleep(0.02)
+
+    assert s.sweep() == 1
+    assert await s.get('b') == 2
+
+
+@pytest.mark.asyncio
+async def test_ttl_refresh_keeps_expiry_heap_bounded():
+    s = StateEngine()
+
+    for i in range(10_000):
+        await s.set_with_ttl('hot', i, ttl_seconds=60)
+
+    assert len(s._expiry_heap) <= 2 * len(s._ttl) + 64
+    assert await s.get('hot') == 9_999
+
+
+@pytest.mark.asyncio
+async def test_auto_sweep_expires_keys_on_timer():
+    s = StateEngine(auto_sweep=True)
+
+    await s.set_with_ttl('a', 1, ttl_seconds=0.01)
+    await s.set_with_ttl('b', 2, ttl_seconds=0.01)
+    # Перезапись без TTL отменяет таймер
+    await s.set('b', 3)
+    await asyncio.sleep(0.03)
+
+    assert 'a' not in s._state
+    assert await s.get('b') == 3
+    assert s._expiry_handles == {}
+
+
+@pytest.mark.asyncio
+async def test_auto_sweep_timers_do_not_keep_engine_alive():
+    import gc
+    import weakref
+
+    s = StateEngine(auto_sweep=True)
+    await s.set_with_ttl('a', 1, ttl_seconds=60)
+    ref = weakref.ref(s)
+
+    del s
+    gc.collect()
+    assert ref() is None
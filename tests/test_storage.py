@@ -24,3 +24,157 @@ async def test_storage_crud(memory_adapter):
 
     await storage.close()
     assert memory_adapter.closed is True
+
+
+@pytest.mark.asyncio
+async def test_storage_batch_get(memory_adapter):
+    storage = Storage(memory_adapter)
+
+    await storage.batch_set('ns', {'a': {'v': 1}, 'b': {'v': 2}})
+    got = await storage.batch_get('ns', ['a', 'b', 'missing'])
+    assert got == {'a': {'v': 1}, 'b': {'v': 2}}
+
+    with pytest.raises(ValueError, match="key must be non-empty string"):
+        await storage.batch_get('ns', ['a', ''])
+
+
+@pytest.mark.asyncio
+async def test_sqlite_batch_get(tmp_path):
+    from adapters.sqlite_adapter import SQLiteAdapter
+
+    adapter = SQLiteAdapter(str(tmp_path / 'test.db'))
+    await adapter.initialize_schema()
+    storage = Storage(adapter)
+
+    await storage.batch_set('ns', {'a': {'v': 1}, 'b': {'v': 2}})
+    await storage.set('other', 'a', {'v': 3})
+    assert await storage.batch_get('ns', ['a', 'b', 'c']) == {'a': {'v': 1}, 'b': {'v': 2}}
+    assert await storage.batch_get('ns', []) == {}
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_iter_keys_pages_with_prefix_and_limit(tmp_path, monkeypatch):
+    import adapters.sqlite_adapter as sqlite_adapter
+    from adapters.sqlite_adapter import SQLiteAdapter
+
+    # Маленькая страница, чтобы проверить переход между страницами
+    monkeypatch.setattr(sqlite_adapter, '_KEYS_PAGE_SIZE', 2)
+    adapter = SQLiteAdapter(str(tmp_path / 'test.db'))
+    await adapter.initialize_schema()
+    storage = Storage(adapter)
+
+    await storage.batch_set('ns', {f'lamp_{i}': {'v': i} for i in range(5)})
+    await storage.set('ns', 'LAMP_upper', {'v': 0})
+    await storage.set('ns', 'sensor', {'v': 0})
+
+    assert [k async for k in storage.iter_keys('ns', prefix='lamp_')] == [
+        f'lamp_{i}' for i in range(5)
+    ]
+    assert [k async for k in storage.iter_keys('ns', limit=3)] == ['LAMP_upper', 'lamp_0', 'lamp_1']
+    assert len([k async for k in storage.iter_keys('ns')]) == 7
+    assert [k async for k in storage.iter_keys('ns', prefix='sensor')] == ['sensor']
+    assert [k async for k in storage.iter_keys('ns', prefix='lamp_4x')] == []
+    await storage.close()
+
+
+def test_sqlite_prefix_upper_bound():
+    from adapters.sqlite_adapter import _prefix_upper_bound
+
+    assert _prefix_upper_bound('') is None
+    assert _prefix_upper_bound('lamp_') == 'lamp`'
+    assert _prefix_upper_bound('a' + chr(0x10FFFF)) == 'b'
+    assert _prefix_upper_bound('\ud7ff') == '\ue000'
+
+
+@pytest.mark.asyncio
+async def test_storage_transaction_commits_and_propagates_errors(tmp_path):
+    from adapters.sqlite_adapter import SQLiteAdapter
+
+    adapter = SQLiteAdapter(str(tmp_path / 'test.db'))
+    await adapter.initialize_schema()
+    storage = Storage(adapter)
+
+    async def write(s):
+        await s.set('ns', 'k', {'v': 1})
+        return 'done'
+
+    assert await storage.transaction_callback(write) == 'done'
+
+    with pytest.raises(RuntimeError):
+        async with storage.transaction():
+            raise RuntimeError('boom')
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_initialize_schema_records_version(tmp_path):
+    import sqlite3
+    from adapters.sqlite_adapter import SQLiteAdapter, _SCHEMA_VERSION
+
+    db_path = str(tmp_path / 'test.db')
+    adapter = SQLiteAdapter(db_path)
+    await adapter.initialize_schema()
+    await adapter.set('ns', 'k', {'v': 1})
+    await adapter.close()
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute('PRAGMA user_version').fetchone()[0] == _SCHEMA_VERSION
+    conn.close()
+
+    # Повторная инициализация не трогает данные
+    adapter = SQLiteAdapter(db_path)
+    await adapter.initialize_schema()
+    assert await adapter.get('ns', 'k') == {'v': 1}
+    await adapter.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_memory_db_is_shared_between_threads():
+    import asyncio
+    from adapters.sqlite_adapter import SQLiteAdapter
+
+    adapter = SQLiteAdapter(':memory:')
+    await adapter.initialize_schema()
+    storage = Storage(adapter)
+
+    # Операции уходят в разные потоки threadpool — все должны видеть одну БД
+    await asyncio.gather(*(storage.set('ns', f'k{i}', {'v': i}) for i in range(8)))
+    values = await asyncio.gather(*(storage.get('ns', f'k{i}') for i in range(8)))
+    assert values == [{'v': i} for i in range(8)]
+
+    # Другой экземпляр адаптера — отдельная in-memory БД
+    other = SQLiteAdapter(':memory:')
+    await other.initialize_schema()
+    assert await other.get('ns', 'k0') is None
+    await storage.close()
+    await other.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_connection_pragmas(tmp_path):
+    import asyncio
+    from adapters.sqlite_adapter import SQLiteAdapter
+
+    adapter = SQLiteAdapter(str(tmp_path / 'test.db'), synchronous='normal', cache_size_kb=4096, mmap_size=0)
+    await adapter.initialize_schema()
+
+    def _read_pragmas():
+        conn = adapter._get_connection()
+        return {
+            name: conn.execute(f'PRAGMA {name}').fetchone()[0]
+            for name in ('journal_mode', 'synchronous', 'temp_store', 'cache_size', 'mmap_size')
+        }
+
+    pragmas = await asyncio.to_thread(_read_pragmas)
+    assert pragmas == {
+        'journal_mode': 'wal',
+        'synchronous': 1,  # NORMAL
+        'temp_store': 2,  # MEMORY
+        'cache_size': -4096,
+        'mmap_size': 0,
+    }
+    await adapter.close()
+
+    with pytest.raises(ValueError):
+        SQLiteAdapter(':memory:', synchronous='sometimes')
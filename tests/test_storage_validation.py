@@ -155,3 +155,256 @@ async def test_storage_mirror_validates_types(memory_adapter):
     # Должно падать с пустым namespace
     with pytest.raises(ValueError, match="namespace must be non-empty string"):
         await storage_mirror.set("", "key", {"value": 1})
+
+
+@pytest.mark.asyncio
+async def test_storage_mirror_get_reads_through_cache(memory_adapter):
+    """Проверка, что get() обслуживается из кеша после первого чтения."""
+    from core.storage_mirror import StorageWithStateMirror
+    from core.state_engine import StateEngine
+    
+    storage = Storage(memory_adapter)
+    state_engine = StateEngine()
+    storage_mirror = StorageWithStateMirror(storage, state_engine)
+    
+    await storage.set("test", "key", {"value": 1})
+    assert await storage_mirror.get("test", "key") == {"value": 1}
+    
+    # Повторное чтение в пределах TTL не обращается к адаптеру
+    memory_adapter._data.clear()
+    assert await storage_mirror.get("test", "key") == {"value": 1}
+    
+    # Промах кешируется, но set() сбрасывает negative cache
+    assert await storage_mirror.get("test", "missing") is None
+    await storage_mirror.set("test", "missing", {"value": 2})
+    assert await storage_mirror.get("test", "missing") == {"value": 2}
+    
+    # clear_namespace() очищает и зеркала
+    await storage_mirror.clear_namespace("test")
+    assert await storage_mirror.get("test", "key") is None
+
+
+@pytest.mark.asyncio
+async def test_storage_mirror_get_returns_copies(memory_adapter):
+    """Проверка, что изменение результата get() без set() не меняет кеш."""
+    from core.storage_mirror import StorageWithStateMirror
+    from core.state_engine import StateEngine
+    
+    storage = Storage(memory_adapter)
+    storage_mirror = StorageWithStateMirror(storage, StateEngine())
+    await storage.set("devices", "d1", {"id": "d1", "state": {"on": False}})
+    
+    device = await storage_mirror.get("devices", "d1")
+    device["last_seen"] = 1.0
+    device["state"]["on"] = True
+    
+    assert await storage_mirror.get("devices", "d1") == await storage.get("devices", "d1")
+    batch = await storage_mirror.batch_get("devices", ["d1"])
+    batch["d1"]["state"]["on"] = True
+    assert await storage_mirror.batch_get("devices", ["d1"]) == {"d1": await storage.get("devices", "d1")}
+
+
+@pytest.mark.asyncio
+async def test_storage_mirror_set_copies_value(memory_adapter):
+    """Проверка, что изменение переданного в set() dict не меняет зеркало и буфер."""
+    from core.storage_mirror import StorageWithStateMirror
+    from core.state_engine import StateEngine
+    
+    state_engine = StateEngine()
+    storage_mirror = StorageWithStateMirror(Storage(memory_adapter), state_engine)
+    device = {"id": "d1", "state": {"on": False}}
+    await storage_mirror.set("devices", "d1", device)
+    device["state"]["on"] = True
+    assert await state_engine.get("devices.d1") == {"id": "d1", "state": {"on": False}}
+    
+    write_back = StorageWithStateMirror(Storage(memory_adapter), StateEngine(), write_back_delay=60)
+    device = {"id": "d2", "state": {"on": False}}
+    await write_back.set("devices", "d2", device)
+    device["state"]["on"] = True
+    assert await write_back.get("devices", "d2") == {"id": "d2", "state": {"on": False}}
+    await write_back.flush()
+    assert await write_back.get("devices", "d2") == {"id": "d2", "state": {"on": False}}
+
+
+@pytest.mark.asyncio
+async def test_storage_mirror_cache_keys_do_not_collide(memory_adapter):
+    """Проверка, что ("a.b", "c") и ("a", "b.c") кешируются раздельно."""
+    from core.storage_mirror import StorageWithStateMirror
+    from core.state_engine import StateEngine
+    
+    storage_mirror = StorageWithStateMirror(Storage(memory_adapter), StateEngine())
+    await storage_mirror.set("a.b", "c", {"value": 1})
+    
+    assert await storage_mirror.get("a.b", "c") == {"value": 1}
+    assert await storage_mirror.get("a", "b.c") is None
+    assert await storage_mirror.batch_get("a", ["b.c"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_storage_mirror_cache_expires(memory_adapter, monkeypatch):
+    """Проверка, что запись в storage в обход обёртки видна после TTL кеша."""
+    import asyncio
+    import core.storage_mirror as storage_mirror_module
+    from core.storage_mirror import StorageWithStateMirror
+    from core.state_engine import StateEngine
+    
+    monkeypatch.setattr(storage_mirror_module, "_CACHE_TTL", 0.01)
+    storage = Storage(memory_adapter)
+    storage_mirror = StorageWithStateMirror(storage, StateEngine())
+    await storage.set("auth", "key", {"revoked": False})
+    assert await storage_mirror.get("auth", "key") == {"revoked": False}
+    
+    # Запись другим процессом / скриптом напрямую в storage
+    await storage.set("auth", "key", {"revoked": True})
+    await asyncio.sleep(0.02)
+    assert await storage_mirror.get("auth", "key") == {"revoked": True}
+
+
+@pytest.mark.asyncio
+async def test_storage_mirror_get_coalesces_concurrent_misses(memory_adapter):
+    """Проверка, что одновременные промахи по ключу дают один запрос к storage."""
+    import asyncio
+    from core.storage_mirror import StorageWithStateMirror
+    from core.state_engine import StateEngine
+    
+    calls = 0
+    original_get = memory_adapter.get
+    
+    async def counting_get(namespace, key):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return await original_get(namespace, key)
+    
+    memory_adapter.get = counting_get
+    storage = Storage(memory_adapter)
+    storage_mirror = StorageWithStateMirror(storage, StateEngine())
+    await storage.set("test", "key", {"value": 1})
+    
+    results = await asyncio.gather(*(storage_mirror.get("test", "key") for _ in range(10)))
+    assert results == [{"value": 1}] * 10
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_storage_mirror_get_survives_leader_cancellation(memory_adapter):
+    """Проверка, что отмена первого get() не отменяет загрузку для остальных."""
+    import asyncio
+    from core.storage_mirror import StorageWithStateMirror
+    from core.state_engine import StateEngine
+    
+    release = asyncio.Event()
+    original_get = memory_adapter.get
+    
+    async def slow_get(namespace, key):
+        await release.wait()
+        return await original_get(namespace, key)
+    
+    memory_adapter.get = slow_get
+    storage = Storage(memory_adapter)
+    storage_mirror = StorageWithStateMirror(storage, StateEngine())
+    await storage.set("test", "key", {"value": 1})
+    
+    leader = asyncio.create_task(storage_mirror.get("test", "key"))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(storage_mirror.get("test", "key"))
+    await asyncio.sleep(0)
+    
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    release.set()
+    assert await waiter == {"value": 1}
+
+
+@pytest.mark.asyncio
+async def test_storage_mirror_clear_namespace_discards_inflight_load(memory_adapter):
+    """Проверка, что загрузка, начатая до clear_namespace(), не возвращает значение в зеркало."""
+    import asyncio
+    from core.storage_mirror import StorageWithStateMirror
+    from core.state_engine import StateEngine
+    
+    loaded = asyncio.Event()
+    release = asyncio.Event()
+    original_get = memory_adapter.get
+    
+    async def slow_get(namespace, key):
+        value = await original_get(namespace, key)
+        loaded.set()
+        await release.wait()
+        return value
+    
+    memory_adapter.get = slow_get
+    storage = Storage(memory_adapter)
+    state_engine = StateEngine()
+    storage_mirror = StorageWithStateMirror(storage, state_engine)
+    await storage.set("test", "key", {"value": 1})
+    
+    pending = asyncio.create_task(storage_mirror.get("test", "key"))
+    await loaded.wait()
+    await storage_mirror.clear_namespace("test")
+    release.set()
+    assert await pending == {"value": 1}
+    
+    assert await state_engine.get("test.key") is None
+    assert await storage_mirror.get("test", "key") is None
+
+
+@pytest.mark.asyncio
+async def test_storage_mirror_write_back_batches_sets(memory_adapter):
+    """Проверка write-back режима: set() виден сразу, в storage пишется пачкой."""
+    import asyncio
+    from core.storage_mirror import StorageWithStateMirror
+    from core.state_engine import StateEngine
+    
+    batches = []
+    original_batch_set = memory_adapter.batch_set
+    
+    async def recording_batch_set(namespace, items):
+        batches.append((namespace, dict(items)))
+        await original_batch_set(namespace, items)
+    
+    memory_adapter.batch_set = recording_batch_set
+    storage = Storage(memory_adapter)
+    storage_mirror = StorageWithStateMirror(storage, StateEngine(), write_back_delay=0.01)
+    
+    for i in range(5):
+        await storage_mirror.set("telemetry", f"k{i}", {"value": i})
+    
+    # Read-your-writes до записи в storage
+    assert await storage_mirror.get("telemetry", "k3") == {"value": 3}
+    assert await storage.get("telemetry", "k3") is None
+    
+    with pytest.raises(TypeError, match="value must be dict"):
+        await storage_mirror.set("telemetry", "bad", "not a dict")
+    
+    await asyncio.sleep(0.05)
+    assert len(batches) == 1
+    assert await storage.get("telemetry", "k3") == {"value": 3}
+    
+    # close() дописывает остаток буфера
+    await storage_mirror.set("telemetry", "last", {"value": 99})
+    await storage_mirror.close()
+    assert await storage.get("telemetry", "last") == {"value": 99}
+
+
+@pytest.mark.asyncio
+async def test_storage_mirror_batch_set_updates_state_engine(memory_adapter):
+    """Проверка, что batch_set() пишет пачкой и обновляет зеркала."""
+    from core.storage_mirror import StorageWithStateMirror
+    from core.state_engine import StateEngine
+    
+    storage = Storage(memory_adapter)
+    state_engine = StateEngine()
+    storage_mirror = StorageWithStateMirror(storage, state_engine)
+    
+    # Промах закеширован — batch_set() должен его сбросить
+    assert await storage_mirror.get("test", "a") is None
+    await storage_mirror.batch_set("test", {"a": {"value": 1}, "b": {"value": 2}})
+    assert await storage.get("test", "b") == {"value": 2}
+    assert await state_engine.get("test.a") == {"value": 1}
+    assert await storage_mirror.get("test", "a") == {"value": 1}
+    
+    with pytest.raises(TypeError):
+        await storage_mirror.batch_set("test", {"c": "not a dict"})
+    assert await state_engine.get("test.c") is None